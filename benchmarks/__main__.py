@@ -0,0 +1,5 @@
+# -*- coding:utf-8 -*-
+import sys
+from benchmarks.run import main
+
+sys.exit(main())
@@ -0,0 +1,128 @@
+# -*- coding:utf-8 -*-
+import random
+
+# each generator returns (schema, list of json values); the values conform to the schema.
+# `size` scales the shape of the schema, `n` is the number of values
+
+
+def _atoms(rnd):
+    return [
+        ({"type": "string"}, lambda: "s{}".format(rnd.randint(0, 10 ** 6))),
+        ({"type": "integer"}, lambda: str(rnd.randint(0, 10 ** 6))),
+        ({"type": "number"}, lambda: rnd.random()),
+        ({"type": "boolean"}, lambda: rnd.choice(["true", "false"])),
+        ({"type": "string", "format": "date-time"},
+         lambda: "2000-01-{:02d}T{:02d}:00:00Z".format(rnd.randint(1, 28), rnd.randint(0, 23))),
+    ]
+
+
+def wide(size=50, n=200, seed=0):
+    # a flat object with many properties
+    rnd = random.Random(seed)
+    atoms = _atoms(rnd)
+    fields = [("f{}".format(i),) + atoms[i % len(atoms)] for i in range(size)]
+    schema = {"type": "object", "properties": {name: sub for name, sub, _ in fields}}
+    data = [{name: gen() for name, _, gen in fields} for _ in range(n)]
+    return schema, data
+
+
+def nested(size=30, n=50, seed=0):
+    # objects nested `size` levels deep
+    rnd = random.Random(seed)
+    schema = {"type": "object", "properties": {"id": {"type": "integer"}}}
+    for _ in range(size):
+        schema = {"type": "object", "properties": {"id": {"type": "integer"}, "child": schema}}
+
+    def make(depth):
+        if depth == 0:
+            return {"id": str(rnd.randint(0, 100))}
+        return {"id": str(rnd.randint(0, 100)), "child": make(depth - 1)}
+    return schema, [make(size) for _ in range(n)]
+
+
+def large_array(size=5000, n=2, seed=0):
+    # a few documents, each holding a large array of small records
+    rnd = random.Random(seed)
+    schema = {"type": "object",
+              "properties": {"items": {"type": "array",
+                                       "items": {"type": "object",
+                                                 "properties": {"id": {"type": "integer"},
+                                                                "name": {"type": "string"},
+                                                                "score": {"type": "number"}}}}}}
+    data = [{"items": [{"id": str(i), "name": "n{}".format(i), "score": rnd.random()} for i in range(size)]}
+            for _ in range(n)]
+    return schema, data
+
+
+def refs(size=20, n=100, seed=0):
+    # many definitions, referencing each other in a chain
+    rnd = random.Random(seed)
+    definitions = {}
+    for i in range(size):
+        properties = {"id": {"type": "integer"}, "name": {"type": "string"}}
+        if i + 1 < size:
+            properties["next"] = {"$ref": "#/definitions/D{}".format(i + 1)}
+        definitions["D{}".format(i)] = {"type": "object", "properties": properties}
+    schema = {"type": "object", "definitions": definitions,
+              "properties": {"head": {"$ref": "#/definitions/D0"},
+                             "items": {"type": "array", "items": {"$ref": "#/definitions/D{}".format(size - 1)}}}}
+
+    def make(i):
+        d = {"id": str(i), "name": "d{}".format(rnd.randint(0, 100))}
+        if i + 1 < size:
+            d["next"] = make(i + 1)
+        return d
+    data = [{"head": make(0), "items": [make(size - 1) for _ in range(5)]} for _ in range(n)]
+    return schema, data
+
+
+def patterns(size=20, n=200, seed=0):
+    # patternProperties with many patterns, keys taken from the values
+    rnd = random.Random(seed)
+    schema = {"type": "object",
+              "patternProperties": {"^p{}_[0-9]+$".format(i): {"type": "integer"} for i in range(size)},
+              "additionalProperties": False}
+    data = [{"p{}_{}".format(rnd.randint(0, size - 1), j): str(j) for j in range(20)} for _ in range(n)]
+    return schema, data
+
+
+def one_of(size=10, n=500, seed=0):
+    # a oneOf union of objects distinguished by their property names
+    rnd = random.Random(seed)
+    definitions = {"V{}".format(i): {"type": "object",
+                                     "properties": {"kind": {"type": "string"},
+                                                    "v{}".format(i): {"type": "integer"}}}
+                   for i in range(size)}
+    schema = {"type": "object", "definitions": definitions,
+              "properties": {"values": {"type": "array",
+                                        "items": {"oneOf": [{"$ref": "#/definitions/V{}".format(i)}
+                                                            for i in range(size)]}}}}
+
+    def make():
+        i = rnd.randint(0, size - 1)
+        return {"kind": "V{}".format(i), "v{}".format(i): str(i)}
+    data = [{"values": [make() for _ in range(10)]} for _ in range(n)]
+    return schema, data
+
+
+def all_of(size=10, n=300, seed=0):
+    # an object composed of allOf mixins
+    rnd = random.Random(seed)
+    definitions = {"M{}".format(i): {"type": "object",
+                                     "properties": {"m{}".format(i): {"type": "integer"}}}
+                   for i in range(size)}
+    schema = {"type": "object", "definitions": definitions,
+              "allOf": [{"$ref": "#/definitions/M{}".format(i)} for i in range(size)]}
+    data = [{"m{}".format(i): str(rnd.randint(0, 100)) for i in range(size)} for _ in range(n)]
+    return schema, data
+
+
+generators = {
+    "wide": wide,
+    "nested": nested,
+    "large_array": large_array,
+    "refs": refs,
+    "patterns": patterns,
+    "one_of": one_of,
+    "all_of": all_of,
+}
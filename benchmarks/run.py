@@ -0,0 +1,109 @@
+# -*- coding:utf-8 -*-
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from jsonschemawalker import ToPythonWalker, ToJSONDictWalker
+from benchmarks.generators import generators
+
+
+def dict_getter(d, k, default):
+    return d.get(k, default)
+
+
+def measure(fn, values, repeat=5):
+    # best wall time of converting all values, and the peak of traced memory while keeping the results
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for v in values:
+            fn(v)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        results = [fn(v) for v in values]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return {"seconds": best, "values_per_sec": len(values) / best if best else 0.0, "peak_bytes": peak}
+
+
+def run_case(name, scale=1.0, repeat=5):
+    # `scale` changes the number of values, not the shape of the schema
+    generate = generators[name]
+    n = generate.__defaults__[1]
+    schema, data = generate(n=max(1, int(n * scale)))
+    to_python = ToPythonWalker(schema)
+    objs = [to_python(v) for v in data]
+    to_jsondict = ToJSONDictWalker(schema, dict_getter)
+    return {"to_python": measure(to_python, data, repeat=repeat),
+            "to_jsondict": measure(to_jsondict, objs, repeat=repeat)}
+
+
+def run(names=None, scale=1.0, repeat=5):
+    names = names or sorted(generators.keys())
+    return {
+        "meta": {"python": platform.python_version(),
+                 "implementation": platform.python_implementation(),
+                 "platform": platform.platform(),
+                 "scale": scale,
+                 "repeat": repeat},
+        "results": {name: run_case(name, scale=scale, repeat=repeat) for name in names},
+    }
+
+
+def compare(results, baseline, tolerance=0.1):
+    # (case, direction, metric, baseline value, current value) of each regression beyond `tolerance`
+    regressions = []
+    for name, directions in sorted(results["results"].items()):
+        for direction, current in sorted(directions.items()):
+            base = baseline.get("results", {}).get(name, {}).get(direction)
+            if base is None:
+                continue
+            if current["values_per_sec"] < base["values_per_sec"] * (1 - tolerance):
+                regressions.append((name, direction, "values_per_sec", base["values_per_sec"], current["values_per_sec"]))
+            if current["peak_bytes"] > base["peak_bytes"] * (1 + tolerance):
+                regressions.append((name, direction, "peak_bytes", base["peak_bytes"], current["peak_bytes"]))
+    return regressions
+
+
+def format_results(results):
+    lines = ["{:<12} {:<12} {:>14} {:>12}".format("case", "direction", "values/sec", "peak KiB")]
+    for name, directions in sorted(results["results"].items()):
+        for direction, r in sorted(directions.items()):
+            lines.append("{:<12} {:<12} {:>14.1f} {:>12.1f}".format(name, direction, r["values_per_sec"],
+                                                                   r["peak_bytes"] / 1024.0))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--only", action="append", choices=sorted(generators.keys()))
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results as json")
+    parser.add_argument("--baseline", help="json written by an earlier run, to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = run(args.only, scale=args.scale, repeat=args.repeat)
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w") as wf:
+            json.dump(results, wf, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as rf:
+            baseline = json.load(rf)
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        for name, direction, metric, before, after in regressions:
+            print("regression: {} {} {}: {:.1f} -> {:.1f}".format(name, direction, metric, before, after))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
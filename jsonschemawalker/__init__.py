@@ -1,10 +1,16 @@
 # -*- coding:utf-8 -*-
+import functools
+import json
 import logging
 import re
-from dateutil import parser as du_parser
-import pytz
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from jsonschemawalker.cache import LRUCache
+from jsonschemawalker.resolver import RefResolver, resolve_pointer, rebase_refs, escape, unescape
 logger = logging.getLogger(__name__)
 
+__version__ = "0.1.1"
+
 
 def identity(v):
     return v
@@ -15,18 +21,36 @@ def as_none(v):
 
 
 def as_bool(s):
+    if s.__class__ is bool:
+        return s
     b = s.lower()
     return not (b == "false")
 
 
+def _parse_datetime(s):
+    from dateutil import parser
+    return parser.parse(s)
+
+
 def as_datetime(s):
-    return du_parser.parse(s)
+    # RFC 3339 / ISO-8601 goes through fromisoformat, anything else through dateutil
+    try:
+        if s[-1:] in ("Z", "z"):
+            return datetime.fromisoformat(s[:-1] + "+00:00")
+        return datetime.fromisoformat(s)
+    except ValueError:
+        return _parse_datetime(s)
+
+
+# for data with many repeated timestamps. datetime objects are immutable, so sharing them is safe
+as_datetime_cached = functools.lru_cache(maxsize=4096)(as_datetime)
+as_datetime_cached.__qualname__ = as_datetime_cached.__name__ = "as_datetime_cached"  # pickled by this name
 
 
 def string_from_datetime(dt):
-    if dt.tzinfo:
-        return dt.isoformat()
-    return pytz.utc.localize(dt).isoformat()
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat()
 
 
 # type, format -> convert-function
@@ -49,11 +73,60 @@ default_python_to_json_mapping = {
 }
 
 
+class Interner(object):
+    # bounded tables deduplicating converted values, one table per convert function.
+    # only str inputs are looked up (1, 1.0 and True are equal as keys). a full table is cleared
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.tables = {}
+
+    def get_table(self, k):
+        try:
+            return self.tables[k]
+        except KeyError:
+            table = self.tables[k] = {}
+            return table
+
+    def wrap(self, convert):
+        table = self.get_table(convert)
+        maxsize = self.maxsize
+
+        def interned(v):
+            if v.__class__ is not str:
+                return convert(v)
+            try:
+                return table[v]
+            except KeyError:
+                x = convert(v)
+                if len(table) >= maxsize:
+                    table.clear()
+                table[v] = x
+                return x
+        interned.convert = convert
+        return interned
+
+    def intern_key(self, k):
+        table = self.get_table("keys")
+        try:
+            return table[k]
+        except KeyError:
+            if len(table) >= self.maxsize:
+                table.clear()
+            table[k] = k
+            return k
+
+
 class Converter(object):
-    def __init__(self, mapping, default=None, kindly=True):
+    # intern=True (or an Interner) shares equal converted values between records.
+    # it applies to enum properties and to properties having "x-intern": true ("x-intern": false opts out),
+    # and to the keys taken from values (patternProperties)
+    def __init__(self, mapping, default=None, kindly=True, intern=False):
         self.mapping = mapping
         self.default = default
         self.kindly = kindly
+        if intern is True:
+            intern = Interner()
+        self.interner = intern or None
 
     def get_convert(self, schema):
         k = (schema.get("type"), schema.get("format"))
@@ -61,8 +134,21 @@ class Converter(object):
         if v is None and self.kindly:
             k = self.mapping.get(schema.get("type"), None)
             v = self.mapping.get(k, identity)
+        if self.interner is not None and self.should_intern(schema):
+            v = self.interner.wrap(v)
         return v
 
+    def should_intern(self, schema):
+        flag = schema.get("x-intern")
+        if flag is not None:
+            return bool(flag)
+        return "enum" in schema
+
+    def is_compatible(self, other):
+        # a plan compiled with one of them walks the same with the other
+        return self is other or (self.mapping == other.mapping and self.kindly == other.kindly
+                                 and (self.interner is None) == (other.interner is None))
+
     def __call__(self, schema, value):
         if value is None:
             return self.default
@@ -70,9 +156,14 @@ class Converter(object):
 
 
 class Control(object):
-    def __init__(self):
-        self.merged_cache = {}
-        self.regexp_cache = {}
+    # each walker has its own Control unless one is passed explicitly.
+    # the caches are bounded and locked, so a Control can also be shared between threads
+    def __init__(self, merged_cache_size=256, regexp_cache_size=256):
+        self.merged_cache = LRUCache(merged_cache_size)  # identity of allOf -> merged schema
+        self.regexp_cache = LRUCache(regexp_cache_size)  # pattern -> compiled regexp
+
+    def info(self):
+        return {"merged": self.merged_cache.info(), "regexp": self.regexp_cache.info()}
 
     def get_wrapper(self, schema, params, dict_of_wrapper):
         if "title" in schema:
@@ -115,7 +206,7 @@ class Control(object):
                 for k, v in schema.items():
                     yield k, v
             properties = schema["properties"]
-            if hasattr(properties, "$order"):
+            if "$order" in properties:
                 for k in properties["$order"]:
                     yield k, properties[k]
             else:
@@ -124,12 +215,9 @@ class Control(object):
 
     def track_reference(self, schema, root_schema):
         ref = schema["$ref"]
-        if not ref.startswith("#/"):
-            raise NotImplemented(ref)
-        target = root_schema
-        for k in ref.split("/")[1:]:
-            target = target[k]
-        return target
+        if not ref.startswith("#"):
+            raise NotImplementedError("use RefResolver for external reference: {}".format(ref))
+        return resolve_pointer(root_schema, ref)
 
     def detect_property_names(self, schema):
         # todo: patternProperties
@@ -152,84 +240,646 @@ class Control(object):
             xs.append((score, c))
         return max(xs, key=lambda p: p[0])[1]
 
-    def detect_merged(self, candidates, root_schema):
-        k = tuple([d["$ref"] for d in candidates])
+    def detect_merged(self, candidates, root_schema, resolver=None, base_uri=None):
+        k = (id(candidates), id(root_schema))
+        entry = self.merged_cache.get(k)
+        if entry is not None and entry[0] is candidates and entry[1] is root_schema:
+            return entry[2]
+        new_schema = {"type": "object", "properties": {}}
+        self.merge(new_schema, candidates, root_schema, resolver, base_uri)
+        self.merged_cache[k] = (candidates, root_schema, new_schema)
+        return new_schema
+
+    def merge(self, new_schema, candidates, root_schema, resolver, base_uri, merged_uri=None):
+        # merged_uri is the uri of the document the merged schema is compiled in.
+        # $refs of subschemas taken from other documents are made absolute
+        if merged_uri is None:
+            merged_uri = base_uri
+        for c in candidates:
+            uri = base_uri
+            if "$ref" in c:
+                if resolver is None:
+                    c = self.track_reference(c, root_schema)
+                else:
+                    uri, c = resolver.resolve(c["$ref"], base_uri)
+            if "allOf" in c:
+                self.merge(new_schema, c["allOf"], root_schema, resolver, uri, merged_uri)
+            if uri != merged_uri:
+                c = rebase_refs(c, uri)
+            for k, v in self.iterate_properties(c, None) if "properties" in c else ():
+                new_schema["properties"][k] = v
+            if "patternProperties" in c:
+                new_schema.setdefault("patternProperties", {}).update(c["patternProperties"])
+            for name in c.get("required", ()):
+                required = new_schema.setdefault("required", [])
+                if name not in required:
+                    required.append(name)
+            if c.get("additionalProperties", True) is False:
+                new_schema["additionalProperties"] = False
+
+
+def _ref_name(ref):
+    return unescape(ref.rsplit("/", 1)[-1])
+
+
+class Node(object):
+    visitor = None
+
+    def __init__(self, schema, path):
+        self.schema = schema
+        self.path = path
+
+
+class AnyNode(Node):
+    visitor = "walk_any"
+
+
+class AtomNode(Node):
+    visitor = "walk_atom"
+
+    def __init__(self, schema, path, convert, default=None):
+        super(AtomNode, self).__init__(schema, path)
+        self.convert = convert
+        self.default = default
+
+
+class ArrayNode(Node):
+    visitor = "walk_array"
+
+    def __init__(self, schema, path, items):
+        super(ArrayNode, self).__init__(schema, path)
+        self.items = items
+
+
+_backreference_rx = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def combine_patterns(regexps):
+    # one regexp whose matched group tells which pattern (in order) searches successfully first
+    if len(regexps) < 2:
+        return None
+    if any(_backreference_rx.search(rx.pattern) for rx in regexps):
+        return None
+    alternatives = ["(?P<_p{}>(?=[\\s\\S]*?(?:{})))".format(i, rx.pattern) for i, rx in enumerate(regexps)]
+    try:
+        return re.compile("|".join(alternatives))
+    except re.error:
+        return None
+
+
+class ObjectNode(Node):
+    visitor = "walk_object"
+    max_decisions = 1024
+
+    def __init__(self, schema, path, name=None, properties=None, patterns=(), additional=True, named=None,
+                 projection=None, intern=None, pruned=()):
+        super(ObjectNode, self).__init__(schema, path)
+        self.name = name
+        self.pruned = pruned  # properties dropped by the projection, passed to wrappers as None
+        self.intern = intern  # applied to the keys taken from the value
+        self.projection = projection  # keys taken from the value are filtered by this
+        # list of (name, node). if None, keys are taken from the value (patternProperties)
+        self.properties = properties
+        self.keys = None if properties is None else tuple(k for k, _ in properties)
+        self.patterns = patterns
+        self.named = named or {}  # properties, checked before patterns
+        self.additional = AnyNode({}, path + "/additionalProperties") if additional else None
+        self.combined = combine_patterns([rx for rx, _ in patterns])
+        # a plain dict shared by the threads using this plan. each get/set is atomic (also on free-threaded
+        # builds), and a lost update only costs a recomputation
+        self.decisions = {}  # key -> node
+
+    def match(self, k):
+        try:
+            return self.decisions[k]
+        except KeyError:
+            pass
+        node = self._match(k)
+        if len(self.decisions) >= self.max_decisions:
+            self.decisions.clear()
+        self.decisions[k] = node
+        return node
+
+    def _match(self, k):
+        if self.projection is not None and self.projection.child(k) is False:
+            return None
+        if k in self.named:
+            return self.named[k]
+        if self.combined is not None:
+            m = self.combined.match(k)
+            if m is None:
+                return self.additional
+            return self.patterns[int(m.lastgroup[2:])][1]
+        for regexp, node in self.patterns:
+            if regexp.search(k) is not None:
+                return node
+        return self.additional
+
+    def iterate(self, keys):
+        intern = self.intern
+        for k in keys:
+            node = self.match(k)
+            if node is not None:
+                yield (k if intern is None else intern(k)), node
+
+
+class RefNode(Node):
+    visitor = "walk_reference"
+
+    def __init__(self, schema, path, ref, name=None, base_uri="", projection=None):
+        super(RefNode, self).__init__(schema, path)
+        self.ref = ref
+        self.name = name
+        self.base_uri = base_uri
+        self.projection = projection
+        self.target = None  # resolved after compiling
+
+
+class OneOfNode(Node):
+    visitor = "walk_one_of"
+
+    max_decisions = 1024
+
+    def __init__(self, schema, path, candidates, discriminator=None, tags=None, aliases=None):
+        super(OneOfNode, self).__init__(schema, path)
+        # list of (frozenset of property names, node)
+        self.candidates = candidates
+        self.names = tuple(sorted(frozenset().union(*[names for names, _ in candidates])))
+        self.aliases = aliases or {}
+        self.discriminator = discriminator  # property name
+        self.tags = tags or {}  # value of discriminator -> node
+        self.decisions = {}  # tuple of keys -> node
+
+    def select(self, value, tag=None):
+        if tag is not None:
+            try:
+                node = self.tags.get(tag)
+            except TypeError:
+                node = None
+            if node is not None:
+                return node
+        k = tuple(value)
         try:
-            return self.merged_cache[k]
+            return self.decisions[k]
         except KeyError:
-            new_schema = {"type": "object", "properties": {}}
-            properties = new_schema["properties"]
-            for c in candidates:
-                properties.update(self.track_reference(c, root_schema)["properties"])
-            self.merged_cache[k] = new_schema
-            return new_schema
+            pass
+        node = self.score(value)
+        if len(self.decisions) >= self.max_decisions:
+            self.decisions.clear()
+        self.decisions[k] = node
+        return node
+
+    def score(self, value):
+        best, best_score = None, -1
+        size = len(value)
+        for names, node in self.candidates:
+            score = len(names.intersection(value))
+            if len(names) == size:
+                score += 1
+            if score > best_score:
+                best, best_score = node, score
+        return best
+
+
+_absent = object()
+
+
+class BranchSelector(object):
+    # oneOf/anyOf selection for python objects, remembered per class
+    def __init__(self, getter, missing_value=None, branches=None):
+        self.getter = getter
+        self.missing_value = missing_value
+        self.branches = branches or {}  # class -> $ref, definition name or title
+        self.cache = {}  # (node, class) -> branch
+
+    def __call__(self, node, value):
+        cls = type(value)
+        try:
+            return self.cache[(node, cls)]
+        except KeyError:
+            pass
+        registered = self.registered(cls)
+        if registered is not None:
+            branch = node.aliases[registered]
+        else:
+            tag = None
+            if node.discriminator is not None:
+                tag = self.getter(value, node.discriminator, None)
+            # presence of the attributes, not their values: an attribute set to None is present,
+            # so the selection does not depend on the instance and can be remembered for the class
+            present = tuple([name for name in node.names if self.getter(value, name, _absent) is not _absent])
+            branch = node.select(present, tag)
+            if node.discriminator is not None or isinstance(value, Mapping):
+                return branch  # depends on the instance, not only on its class
+        self.cache[(node, cls)] = branch
+        return branch
+
+    def registered(self, cls):
+        # registrations are inherited by subclasses
+        if self.branches:
+            for c in cls.__mro__:
+                if c in self.branches:
+                    return self.branches[c]
+        return None
+
+    def register(self, cls, name):
+        self.branches[cls] = name
+        # selections remembered for the class, and for its subclasses, are made again
+        for k in list(self.cache):
+            if issubclass(k[1], cls):
+                self.cache.pop(k, None)
+
+
+class Projection(object):
+    # field mask applied at compile time.
+    # include/exclude are nested dicts (name -> True or a nested dict), arrays are transparent
+    def __init__(self, include=None, exclude=None):
+        self.include = include
+        self.exclude = exclude
+        self.key = (json.dumps(include, sort_keys=True), json.dumps(exclude, sort_keys=True))
+
+    @classmethod
+    def from_spec(cls, include=None, exclude=None):
+        include, exclude = normalize_mask(include), normalize_mask(exclude)
+        if include is None and exclude is None:
+            return None
+        return cls(include, exclude)
+
+    def child(self, k):
+        # -> False (dropped), None (everything below) or a Projection
+        include = exclude = None
+        if self.include is not None:
+            if k not in self.include:
+                return False
+            if self.include[k] is not True:
+                include = self.include[k]
+        if self.exclude is not None and k in self.exclude:
+            if self.exclude[k] is True:
+                return False
+            exclude = self.exclude[k]
+        if include is None and exclude is None:
+            return None
+        return Projection(include, exclude)
+
+
+def normalize_mask(spec):
+    # a set of json pointers ("/users/name", "*" segments are skipped) or a nested dict
+    if spec is None or spec is True:
+        return spec
+    if isinstance(spec, dict):
+        return dict((k, normalize_mask(v) if isinstance(v, dict) else True) for k, v in spec.items())
+    mask = {}
+    for pointer in spec:
+        segments = [unescape(k) for k in pointer.lstrip("#").split("/")[1:] if k not in ("*", "-")]
+        if not segments:
+            return None
+        target = mask
+        for k in segments[:-1]:
+            sub = target.get(k)
+            if sub is True:
+                break
+            target = target.setdefault(k, {})
+        else:
+            target[segments[-1]] = True
+    return mask
+
+
+class Plan(object):
+    converter = None
+
+    def __init__(self, schema, root, references, converter=None):
+        self.schema = schema
+        self.root = root
+        self.references = references  # $ref -> node
+        self.converter = converter  # the convert functions of the nodes are taken from this
+
+
+def check_plan(plan, converter):
+    # a plan converts in one direction only (compile() defaults to json -> python)
+    if plan.converter is not None and not plan.converter.is_compatible(converter):
+        raise ValueError("the plan is compiled with another converter, pass the same converter to the walker")
+    return plan
+
+
+class Compiler(object):
+    def __init__(self, schema, converter, control, resolver, projection=None):
+        self.schema = schema
+        self.projection = projection
+        self.converter = converter
+        self.intern_key = converter.interner.intern_key if converter.interner is not None else None
+        self.control = control
+        self.resolver = resolver
+        self.base_uri = resolver.base_uri  # uri of the document being compiled
+        self.references = {}
+        self.pending = []
+
+    def __call__(self):
+        root = self.compile(self.schema, "#", self.projection)
+        while self.pending:
+            node = self.pending.pop()
+            node.target = self.compile_reference(node.ref, node.base_uri, node.projection)
+        return Plan(self.schema, root, self.references, converter=self.converter)
+
+    def resolve(self, schema):
+        if "$ref" not in schema:
+            return schema
+        return self.resolver.resolve(schema["$ref"], self.base_uri)[1]
+
+    def compile_reference(self, ref, base_uri, projection=None):
+        uri, pointer = self.resolver.canonical(ref, base_uri)
+        if uri == self.resolver.base_uri:
+            k = "#" + pointer
+        else:
+            k = "{}#{}".format(uri, pointer)
+        cache_key = k if projection is None else (k, projection.key)
+        try:
+            return self.references[cache_key]
+        except KeyError:
+            _, target = self.resolver.resolve(ref, base_uri)
+            outer, self.base_uri = self.base_uri, uri
+            try:
+                node = self.references[cache_key] = self.compile(target, k, projection)
+            finally:
+                self.base_uri = outer
+            return node
+
+    def compile(self, schema, path, projection=None):
+        if schema == {}:
+            return AnyNode(schema, path)
+        type_ = schema.get("type", "object")
+        if type_ == "object":
+            if "oneOf" in schema:
+                return self.compile_one_of(schema, path, "oneOf", projection)
+            elif "anyOf" in schema:
+                return self.compile_one_of(schema, path, "anyOf", projection)
+            elif "allOf" in schema:
+                merged = self.control.detect_merged(schema["allOf"], self.schema,
+                                                    resolver=self.resolver, base_uri=self.base_uri)
+                return self.compile_object(merged, path + "/allOf", name=schema.get("title"), projection=projection)
+            elif "$ref" in schema:
+                ref = schema["$ref"]
+                name = schema.get("title") or _ref_name(ref)
+                node = RefNode(schema, path, ref, name=name, base_uri=self.base_uri, projection=projection)
+                self.pending.append(node)
+                return node
+            return self.compile_object(schema, path, name=schema.get("title"), projection=projection)
+        elif type_ == "array":
+            return ArrayNode(schema, path, self.compile(schema["items"], path + "/items", projection))
+        else:
+            return AtomNode(schema, path, self.converter.get_convert(schema), schema.get("default"))
+
+    def compile_one_of(self, schema, path, keyword, projection=None):
+        candidates = []
+        resolved = []
+        aliases = {}  # $ref, definition name or title -> node
+        for i, c in enumerate(schema[keyword]):
+            exact_c = self.resolve(c)
+            names = frozenset(self.control.detect_property_names(exact_c))
+            node = self.compile(c, "{}/{}/{}".format(path, keyword, i), projection)
+            if "$ref" in c:
+                aliases[c["$ref"]] = aliases[_ref_name(c["$ref"])] = node
+            if "title" in exact_c:
+                aliases.setdefault(exact_c["title"], node)
+            candidates.append((names, node))
+            resolved.append(exact_c)
+        discriminator, tags = self.detect_discriminator(schema, keyword, resolved, candidates, aliases)
+        return OneOfNode(schema, path, candidates, discriminator=discriminator, tags=tags, aliases=aliases)
+
+    def detect_discriminator(self, schema, keyword, resolved, candidates, aliases):
+        # explicit `discriminator` (openapi style), or a property having a distinct `const` in every branch
+        if "discriminator" in schema:
+            d = schema["discriminator"]
+            if isinstance(d, dict):
+                prop, mapping = d["propertyName"], d.get("mapping", {})
+            else:
+                prop, mapping = d, {}  # swagger 2.0
+            tags = {}
+            for exact_c, (_, node) in zip(resolved, candidates):
+                for tag in self._const_values(exact_c, prop):
+                    tags[tag] = node
+            for name, node in aliases.items():
+                if "#" not in name:
+                    tags.setdefault(name, node)
+            for tag, ref in mapping.items():
+                if ref in aliases:
+                    tags[tag] = aliases[ref]
+            return prop, tags
+
+        common = None
+        for exact_c in resolved:
+            props = set(k for k, v in exact_c.get("properties", {}).items() if self._const_values(exact_c, k))
+            common = props if common is None else (common & props)
+        for prop in sorted(common or ()):
+            tags = {}
+            for exact_c, (_, node) in zip(resolved, candidates):
+                for tag in self._const_values(exact_c, prop):
+                    tags.setdefault(tag, []).append(node)
+            if all(len(nodes) == 1 for nodes in tags.values()):
+                return prop, dict((tag, nodes[0]) for tag, nodes in tags.items())
+        return None, None
+
+    def _const_values(self, schema, prop):
+        subschema = schema.get("properties", {}).get(prop)
+        if not hasattr(subschema, "get"):
+            return ()
+        if "const" in subschema:
+            return (subschema["const"],)
+        if "enum" in subschema:
+            return tuple(subschema["enum"])
+        return ()
+
+    def compile_object(self, schema, path, name=None, projection=None):
+        if "patternProperties" in schema:
+            # only the keys are projected here, subschemas of patterns are compiled as they are
+            patterns = []
+            for k, v in schema["patternProperties"].items():
+                subpath = "{}/patternProperties/{}".format(path, escape(k))
+                patterns.append((self.control.get_regexp(k), self.compile(v, subpath)))
+            named = {}
+            for k, v, subprojection in self.iterate_properties(schema, projection):
+                named[k] = self.compile(v, "{}/properties/{}".format(path, escape(k)), subprojection)
+            additional = schema.get("additionalProperties", True)
+            return ObjectNode(schema, path, name=name, patterns=patterns, additional=additional, named=named,
+                              projection=projection, intern=self.intern_key)
+        elif "properties" in schema:
+            properties = []
+            for k, v, subprojection in self.iterate_properties(schema, projection):
+                subpath = "{}/properties/{}".format(path, escape(k))
+                properties.append((k, self.compile(v, subpath, subprojection)))
+            pruned = ()
+            if projection is not None:
+                kept = set(k for k, _ in properties)
+                pruned = tuple(k for k, _, _ in self.iterate_properties(schema, None) if k not in kept)
+            return ObjectNode(schema, path, name=name, properties=properties, pruned=pruned)
+        else:
+            return ObjectNode(schema, path, name=name, additional=schema.get("additionalProperties", True),
+                              projection=projection, intern=self.intern_key)
+
+    def iterate_properties(self, schema, projection):
+        if "properties" not in schema:
+            return
+        for k, v in self.control.iterate_properties({"properties": schema["properties"]}, None):
+            if projection is None:
+                yield k, v, None
+            else:
+                subprojection = projection.child(k)
+                if subprojection is not False:
+                    yield k, v, subprojection
+
+
+def compile(schema, converter=None, control=None, resolver=None, projection=None, exclude=None):
+    converter = converter or Converter(default_json_to_python_mapping)
+    control = control or Control()
+    resolver = resolver or RefResolver(schema)
+    projection = Projection.from_spec(projection, exclude)
+    return Compiler(schema, converter, control, resolver, projection=projection)()
 
 
 class ToPythonWalker(object):
     def __init__(self, schema,
                  wrappers=None,
                  factory=dict,
-                 control=Control(),
-                 converter=Converter(default_json_to_python_mapping)):
+                 control=None,
+                 converter=Converter(default_json_to_python_mapping),
+                 projection=None,
+                 exclude=None,
+                 iterative_fallback=False):
         self.wrappers = wrappers or {}
+        self.iterative_fallback = iterative_fallback
         self.converter = converter
-        self.control = control
-        self.schema = schema
+        self.control = control = control or Control()
+        if isinstance(schema, Plan):
+            self.plan = check_plan(schema, converter)
+        else:
+            self.plan = compile(schema, converter=converter, control=control, projection=projection, exclude=exclude)
+        self.schema = self.plan.schema
         self.factory = factory
 
     def __call__(self, value):
-        return self.walk(self.schema, value)
+        try:
+            return self.walk(self.plan.root, value)
+        except RecursionError:
+            # iterative_fallback=True retries a value too deep for the recursive walk with an explicit stack.
+            # the retry does not use overridden walk* methods, and calls the wrappers again
+            if not self.iterative_fallback:
+                raise
+            from jsonschemawalker.iterative import run, python_steps
+            return run(python_steps(self, self.plan.root, value))
 
-    def walk(self, schema, value):
-        if schema == {}:
-            return value
-        type_ = schema.get("type", "object")
-        if type_ == "object":
-            return self.walk_object(schema, value)
-        elif type_ == "array":
-            return self.walk_array(schema, value)
+    def walk(self, node, value):
+        return getattr(self, node.visitor)(node, value)
+
+    def walk_any(self, node, value):
+        return value
+
+    def walk_atom(self, node, value):
+        if value is None:
+            value = node.default
+            if value is None:
+                return self.converter.default
+        return node.convert(value)
+
+    def walk_reference(self, node, value):
+        target = node.target
+        if target.visitor == "walk_object":
+            return self.walk_object(target, value, name=node.name)
+        return self.walk(target, value)
+
+    def walk_one_of(self, node, value):
+        tag = value.get(node.discriminator) if node.discriminator is not None else None
+        return self.walk(node.select(value, tag), value)
+
+    def walk_object(self, node, value, name=None):
+        if value is None:
+            return None
+        if self.wrappers and node.keys is not None:
+            wrapper = self.wrappers.get(name or node.name)
+            if wrapper is not None and getattr(wrapper, "_fields", None) == node.keys:
+                # record classes and namedtuples are built positionally, without the dict
+                return wrapper(*[self.walk(subnode, value.get(k)) for k, subnode in node.properties])
+        r = self.factory()
+        if node.properties is None:
+            for k, subnode in node.iterate(value):
+                r[k] = self.walk(subnode, value[k])
         else:
-            return self.walk_atom(schema, value)
-
-    def walk_atom(self, schema, value):
-        if value is None and "default" in schema:
-            value = schema["default"]
-        return self.converter(schema, value)
-
-    def walk_reference(self, schema):
-        return self.control.track_reference(schema, self.schema)
-
-    def walk_one_of(self, schema, value):
-        matched = self.control.detect_matched(schema["oneOf"], value, self.schema)
-        return self.walk_object(matched, value)
-
-    def walk_any_of(self, schema, value):
-        matched = self.control.detect_matched(schema["anyOf"], value, self.schema)
-        return self.walk_object(matched, value)
-
-    def walk_all_of(self, schema, value):
-        merged = self.control.detect_merged(schema["allOf"], self.schema)
-        return self.walk_object(merged, value)
-
-    def walk_object(self, schema, value):
-        if "oneOf" in schema:
-            return self.walk_one_of(schema, value)
-        elif "anyOf" in schema:
-            return self.walk_any_of(schema, value)
-        elif "allOf" in schema:
-            return self.walk_all_of(schema, value)
-        elif "$ref" in schema:
-            exact_schema = self.walk_reference(schema)
+            for k, subnode in node.properties:
+                r[k] = self.walk(subnode, value.get(k))
+        return self.get_wrapper(name or node.name, r, node)
+
+    def walk_array(self, node, value):
+        if value is None:
+            return None
+        subnode = node.items
+        return [self.walk(subnode, v) for v in value]
+
+    def get_wrapper(self, name, params, node=None):
+        wrapper = self.wrappers.get(name)
+        if wrapper is None:
+            return params
+        if node is not None and node.pruned:
+            for k in node.pruned:
+                params[k] = None
+        return wrapper(**params)
+
+    # column-wise conversion of a batch of values sharing a schema
+
+    def many(self, values):
+        return self.walk_many(self.plan.root, list(values))
+
+    def walk_many(self, node, values):
+        return getattr(self, node.visitor + "_many")(node, values)
+
+    def walk_any_many(self, node, values):
+        return values
+
+    def walk_atom_many(self, node, values):
+        convert = node.convert
+        if node.default is None:
+            missing = self.converter.default
         else:
-            exact_schema = schema
-        r = self.factory()
-        for k, subschema in self.control.iterate_properties(exact_schema, value):
-            r[k] = self.walk(subschema, value.get(k))
-        return self.control.get_wrapper(schema, r, self.wrappers)
+            missing = convert(node.default)
+        if None not in values:
+            if convert is identity:
+                return values
+            return list(map(convert, values))
+        if convert is identity and missing is None:
+            return values
+        return [missing if v is None else convert(v) for v in values]
 
-    def walk_array(self, schema, value):
-        subschema = schema["items"]
-        return [self.walk(subschema, v) for v in value]
+    def walk_reference_many(self, node, values):
+        target = node.target
+        if target.visitor == "walk_object":
+            return self.walk_object_many(target, values, name=node.name)
+        return self.walk_many(target, values)
+
+    def walk_one_of_many(self, node, values):
+        groups = {}
+        for i, v in enumerate(values):
+            tag = v.get(node.discriminator) if node.discriminator is not None else None
+            groups.setdefault(node.select(v, tag), []).append(i)
+        return _scatter(self, groups, values)
+
+    def walk_object_many(self, node, values, name=None):
+        if node.properties is None or None in values:
+            return [self.walk_object(node, v, name=name) for v in values]
+        keys = node.keys
+        columns = [self.walk_many(subnode, [v.get(k) for v in values]) for k, subnode in node.properties]
+        wrapper = self.wrappers.get(name or node.name)
+        if wrapper is not None and getattr(wrapper, "_fields", None) == keys:
+            return [wrapper(*row) for row in zip(*columns)] if columns else [wrapper() for _ in values]
+        if self.factory is dict:
+            rows = [dict(zip(keys, row)) for row in zip(*columns)] if columns else [{} for _ in values]
+        else:
+            rows = [self.factory() for _ in values]
+            for k, column in zip(keys, columns):
+                for r, x in zip(rows, column):
+                    r[k] = x
+        if wrapper is None:
+            return rows
+        return [self.get_wrapper(name or node.name, r, node) for r in rows]
+
+    def walk_array_many(self, node, values):
+        return _walk_array_many(self, node, values)
 
 
 class ToJSONDictWalker(object):
@@ -237,78 +887,223 @@ class ToJSONDictWalker(object):
                  verbose=False,
                  missing_value=None,
                  factory=dict,
-                 control=Control(),
-                 converter=Converter(default_python_to_json_mapping)):
+                 control=None,
+                 converter=Converter(default_python_to_json_mapping),
+                 branches=None,
+                 projection=None,
+                 exclude=None,
+                 iterative_fallback=False):
         self.converter = converter
-        self.control = control
+        self.iterative_fallback = iterative_fallback
+        self.control = control = control or Control()
         self.getter = getter
-        self.schema = schema
+        self.select_branch = BranchSelector(getter, missing_value, branches=branches)
+        if isinstance(schema, Plan):
+            self.plan = check_plan(schema, converter)
+        else:
+            self.plan = compile(schema, converter=converter, control=control, projection=projection, exclude=exclude)
+        self.schema = self.plan.schema
         self.factory = factory
         self.verbose = verbose
         self.missing_value = missing_value
 
     def __call__(self, value):
-        return self.walk(self.schema, value)
+        try:
+            return self.walk(self.plan.root, value)
+        except RecursionError:
+            # iterative_fallback=True retries a value too deep for the recursive walk with an explicit stack.
+            # the retry does not use overridden walk* methods, and calls the wrappers again
+            if not self.iterative_fallback:
+                raise
+            from jsonschemawalker.iterative import run, jsondict_steps
+            return run(jsondict_steps(self, self.plan.root, value))
 
-    def walk(self, schema, value):
-        if schema == {}:
-            return value
-        type_ = schema.get("type", "object")
-        if type_ == "object":
-            return self.walk_object(schema, value)
-        elif type_ == "array":
-            return self.walk_array(schema, value)
-        else:
-            return self.walk_atom(schema, value)
+    def walk(self, node, value):
+        return getattr(self, node.visitor)(node, value)
 
-    def walk_atom(self, schema, value):
-        return self.converter(schema, value)
+    def walk_any(self, node, value):
+        return value
 
-    def walk_one_of(self, schema, value):
-        matched = self.control.detect_matched(schema["oneOf"], value.__dict__, self.schema)  # xxx
-        return self.walk_object(matched, value)
+    def walk_atom(self, node, value):
+        if value is None:
+            return self.converter.default
+        return node.convert(value)
 
-    def walk_any_of(self, schema, value):
-        matched = self.control.detect_matched(schema["anyOf"], value.__dict__, self.schema)  # xxx
-        return self.walk_object(matched, value)
+    def walk_reference(self, node, value):
+        return self.walk(node.target, value)
 
-    def walk_all_of(self, schema, value):
-        merged = self.control.detect_merged(schema["allOf"], self.schema)
-        return self.walk_object(merged, value)
+    def walk_one_of(self, node, value):
+        return self.walk(self.select_branch(node, value), value)
 
-    def walk_reference(self, schema):
-        return self.control.track_reference(schema, self.schema)
+    def register_branch(self, cls, name):
+        self.select_branch.register(cls, name)
 
-    def walk_object(self, schema, value):
-        if "oneOf" in schema:
-            return self.walk_one_of(schema, value)
-        elif "anyOf" in schema:
-            return self.walk_any_of(schema, value)
-        elif "allOf" in schema:
-            return self.walk_all_of(schema, value)
-        elif "$ref" in schema:
-            exact_schema = self.walk_reference(schema)
-        else:
-            exact_schema = schema
+    def walk_object(self, node, value):
+        if value is None:
+            return None  # null, also with verbose=True (not an object of nulls)
         r = self.factory()
-        for k, subschema in self.control.iterate_properties(exact_schema, value):
+        if node.properties is None:
+            properties = node.iterate(value)
+        else:
+            properties = node.properties
+        for k, subnode in properties:
             raw_val = self.getter(value, k, self.missing_value)
             if raw_val == self.missing_value and not self.verbose:
                 continue
-            r[k] = self.walk(subschema, raw_val)
+            r[k] = self.walk(subnode, raw_val)
         return r
 
-    def walk_array(self, schema, value):
-        subschema = schema["items"]
-        return [self.walk(subschema, v) for v in value]
+    def walk_array(self, node, value):
+        if value is None:
+            return None
+        subnode = node.items
+        return [self.walk(subnode, v) for v in value]
+
+    # column-wise conversion of a batch of values sharing a schema
+
+    def many(self, values):
+        return self.walk_many(self.plan.root, list(values))
+
+    def walk_many(self, node, values):
+        return getattr(self, node.visitor + "_many")(node, values)
+
+    def walk_any_many(self, node, values):
+        return values
+
+    def walk_atom_many(self, node, values):
+        convert = node.convert
+        if None not in values:
+            if convert is identity:
+                return values
+            return list(map(convert, values))
+        missing = self.converter.default
+        return [missing if v is None else convert(v) for v in values]
+
+    def walk_reference_many(self, node, values):
+        return self.walk_many(node.target, values)
+
+    def walk_one_of_many(self, node, values):
+        groups = {}
+        for i, v in enumerate(values):
+            groups.setdefault(self.select_branch(node, v), []).append(i)
+        return _scatter(self, groups, values)
+
+    def walk_object_many(self, node, values):
+        if node.properties is None or None in values:
+            return [self.walk_object(node, v) for v in values]
+        getter, missing_value, verbose = self.getter, self.missing_value, self.verbose
+        rows = [self.factory() for _ in values]
+        for k, subnode in node.properties:
+            column = [getter(v, k, missing_value) for v in values]
+            if verbose:
+                for r, x in zip(rows, self.walk_many(subnode, column)):
+                    r[k] = x
+            else:
+                indices = [i for i, x in enumerate(column) if not x == missing_value]
+                converted = self.walk_many(subnode, [column[i] for i in indices])
+                for i, x in zip(indices, converted):
+                    rows[i][k] = x
+        return rows
+
+    def walk_array_many(self, node, values):
+        return _walk_array_many(self, node, values)
+
+
+def _scatter(walker, groups, values):
+    # converts each group of (indices of) values with its own node, keeping the original order
+    result = [None] * len(values)
+    for node, indices in groups.items():
+        for i, x in zip(indices, walker.walk_many(node, [values[i] for i in indices])):
+            result[i] = x
+    return result
+
+
+def _walk_array_many(walker, node, values):
+    # all elements of all arrays are converted as one column, then split again
+    flat = []
+    for value in values:
+        if value is not None:
+            flat.extend(value)
+    converted = walker.walk_many(node.items, flat)
+    result = []
+    i = 0
+    for value in values:
+        if value is None:
+            result.append(None)
+        else:
+            n = len(value)
+            result.append(converted[i:i + n])
+            i += n
+    return result
+
+
+def _fingerprint(schema):
+    return json.dumps(schema, sort_keys=True, default=repr)
+
+
+class WalkerCache(object):
+    def __init__(self, maxsize=128, by_content=False):
+        self.by_content = by_content
+        self.cache = LRUCache(maxsize)
+
+    def get(self, schema, options, create):
+        if self.by_content:
+            k = (_fingerprint(schema), options)
+        else:
+            k = (id(schema), options)
+        # the argument (a schema or a Plan) is kept next to the walker, as id() can be reused after it is freed
+        entry = self.cache.get(k, valid=None if self.by_content else (lambda entry: entry[0] is schema))
+        if entry is None:
+            entry = self.cache[k] = (schema, create())
+        return entry[1]
+
+    def resize(self, maxsize):
+        self.cache.resize(maxsize)
+
+    def clear(self):
+        self.cache.clear()
+
+    def info(self):
+        return self.cache.info()
+
+
+# schemas are identified by id() by default; call walker_cache.clear() after mutating a schema in place
+walker_cache = WalkerCache()
+
+
+def _wrappers_key(wrappers):
+    if not wrappers:
+        return None
+    return tuple(sorted(wrappers.items()))
+
+
+def _mask_key(projection, exclude):
+    if projection is None and exclude is None:
+        return None
+    return json.dumps([normalize_mask(projection), normalize_mask(exclude)], sort_keys=True)
+
+
+def to_python(schema, data, wrappers=None, projection=None, exclude=None):
+    options = (ToPythonWalker, _wrappers_key(wrappers), _mask_key(projection, exclude))
+    return walker_cache.get(schema, options,
+                            lambda: ToPythonWalker(schema, wrappers, projection=projection, exclude=exclude))(data)
+
+
+def to_jsondict(schema, data, getter=getattr, verbose=False, projection=None, exclude=None):
+    options = (ToJSONDictWalker, getter, verbose, _mask_key(projection, exclude))
+    return walker_cache.get(schema, options,
+                            lambda: ToJSONDictWalker(schema, getter, verbose=verbose,
+                                                     projection=projection, exclude=exclude))(data)
 
 
-def to_python(schema, data, wrappers=None):
-    return ToPythonWalker(schema, wrappers)(data)
+def to_python_many(schema, records, wrappers=None):
+    options = (ToPythonWalker, _wrappers_key(wrappers), None)
+    return walker_cache.get(schema, options, lambda: ToPythonWalker(schema, wrappers)).many(records)
 
 
-def to_jsondict(schema, data, getter=getattr, verbose=False):
-    return ToJSONDictWalker(schema, getter, verbose=verbose)(data)
+def to_jsondict_many(schema, objs, getter=getattr, verbose=False):
+    options = (ToJSONDictWalker, getter, verbose, None)
+    return walker_cache.get(schema, options, lambda: ToJSONDictWalker(schema, getter, verbose=verbose)).many(objs)
 
 serialize = to_jsondict
 deserialize = to_python
@@ -0,0 +1,117 @@
+# -*- coding:utf-8 -*-
+import asyncio
+import functools
+import json
+import time
+from jsonschemawalker import ArrayNode, walker_cache, _wrappers_key, to_python, to_jsondict
+from jsonschemawalker.iterative import (
+    IterativeToPythonWalker,
+    IterativeToJSONDictWalker,
+    python_steps,
+    jsondict_steps,
+)
+
+# cooperative conversion for asyncio. the stack-based walkers pause every `every` nodes,
+# and the event loop is given control at those points (at most once per `interval` seconds, if given).
+# with an executor, values larger than `threshold` (len() of the top-level array or object,
+# or of the text for aloads) are converted there instead.
+
+
+async def drive(steps, interval=None):
+    clock = time.perf_counter
+    deadline = clock() + interval if interval else None
+    try:
+        while True:
+            next(steps)
+            if deadline is None or clock() >= deadline:
+                await asyncio.sleep(0)
+                if deadline is not None:
+                    deadline = clock() + interval
+    except StopIteration as e:
+        return e.value
+
+
+def _offloaded(value, executor, threshold):
+    if executor is None:
+        return False
+    try:
+        return len(value) >= (threshold or 0)
+    except TypeError:
+        return False
+
+
+def _python_walker(schema, wrappers):
+    options = (IterativeToPythonWalker, _wrappers_key(wrappers))
+    return walker_cache.get(schema, options, lambda: IterativeToPythonWalker(schema, wrappers))
+
+
+def _jsondict_walker(schema, getter, verbose):
+    options = (IterativeToJSONDictWalker, getter, verbose)
+    return walker_cache.get(schema, options, lambda: IterativeToJSONDictWalker(schema, getter, verbose=verbose))
+
+
+async def ato_python(schema, data, wrappers=None, every=1000, interval=None, executor=None, threshold=None):
+    if _offloaded(data, executor, threshold):
+        fn = functools.partial(to_python, schema, data, wrappers)
+        return await asyncio.get_running_loop().run_in_executor(executor, fn)
+    walker = _python_walker(schema, wrappers)
+    return await drive(walker.steps(data, every=every), interval)
+
+
+async def ato_jsondict(schema, data, getter=getattr, verbose=False, every=1000, interval=None,
+                       executor=None, threshold=None):
+    if _offloaded(data, executor, threshold):
+        fn = functools.partial(to_jsondict, schema, data, getter=getter, verbose=verbose)
+        return await asyncio.get_running_loop().run_in_executor(executor, fn)
+    walker = _jsondict_walker(schema, getter, verbose)
+    return await drive(walker.steps(data, every=every), interval)
+
+
+def _aloads(schema, s, wrappers):
+    return to_python(schema, json.loads(s), wrappers)
+
+
+async def aloads(schema, s, wrappers=None, every=1000, interval=None, executor=None, threshold=None):
+    # decoding is not interruptible, so large texts are better offloaded
+    if _offloaded(s, executor, threshold):
+        fn = functools.partial(_aloads, schema, s, wrappers)
+        return await asyncio.get_running_loop().run_in_executor(executor, fn)
+    return await ato_python(schema, json.loads(s), wrappers=wrappers, every=every, interval=interval)
+
+
+def _items_node(walker):
+    node = walker.plan.root
+    while node.visitor == "walk_reference":
+        node = node.target
+    if isinstance(node, ArrayNode):
+        return node.items
+    return node
+
+
+async def _aiter(walker, steps, data, every, interval):
+    node = _items_node(walker)
+    if not hasattr(data, "__aiter__"):
+        data = _as_async(data)
+    n = 0
+    async for v in data:
+        yield await drive(steps(walker, node, v, every=every), interval)
+        # small elements never pause by themselves, so each one also counts as a node
+        n += 1
+        if n >= every:
+            n = 0
+            await asyncio.sleep(0)
+
+
+async def _as_async(iterable):
+    for v in iterable:
+        yield v
+
+
+def aiter_python(schema, data, wrappers=None, every=1000, interval=None):
+    # async for over the converted elements of a top-level array.
+    # `data` is an iterable, or an async iterable (e.g. of records read from a socket)
+    return _aiter(_python_walker(schema, wrappers), python_steps, data, every, interval)
+
+
+def aiter_jsondict(schema, data, getter=getattr, verbose=False, every=1000, interval=None):
+    return _aiter(_jsondict_walker(schema, getter, verbose), jsondict_steps, data, every, interval)
@@ -0,0 +1,82 @@
+# -*- coding:utf-8 -*-
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", "hits misses maxsize currsize")
+
+
+class LRUCache(object):
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize  # None is unbounded, 0 disables caching
+        self.hits = 0
+        self.misses = 0
+        self.data = OrderedDict()
+        self.lock = threading.RLock()
+
+    def __getitem__(self, k):
+        with self.lock:
+            try:
+                v = self.data[k]
+            except KeyError:
+                self.misses += 1
+                raise
+            self.data.move_to_end(k)
+            self.hits += 1
+            return v
+
+    def get(self, k, default=None, valid=None):
+        # a value for which valid(value) is false is counted as a miss
+        with self.lock:
+            try:
+                v = self.data[k]
+            except KeyError:
+                self.misses += 1
+                return default
+            if valid is not None and not valid(v):
+                self.misses += 1
+                return default
+            self.data.move_to_end(k)
+            self.hits += 1
+            return v
+
+    def __setitem__(self, k, v):
+        with self.lock:
+            if self.maxsize == 0:
+                return
+            self.data[k] = v
+            self.data.move_to_end(k)
+            self._evict()
+
+    def __delitem__(self, k):
+        with self.lock:
+            del self.data[k]
+
+    def __contains__(self, k):
+        return k in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def _evict(self):
+        if self.maxsize is not None:
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self.lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.data))
+
+    def __getstate__(self):
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state["maxsize"])
@@ -0,0 +1,232 @@
+# -*- coding:utf-8 -*-
+import logging
+from jsonschemawalker import (
+    Plan,
+    check_plan,
+    BranchSelector,
+    Control,
+    Converter,
+    identity,
+    default_json_to_python_mapping,
+    default_python_to_json_mapping,
+    compile as compile_plan,
+)
+logger = logging.getLogger(__name__)
+
+
+class CodeGenerator(object):
+    def __init__(self, plan, factory=dict, missing=None):
+        self.plan = plan
+        self.factory = factory
+        self.missing = missing
+        self.namespace = {"_factory": factory, "_missing": missing}
+        self.functions = {}  # key -> function name
+        self.chunks = []
+        self.i = 0
+
+    def gensym(self, prefix):
+        self.i += 1
+        return "{}{}".format(prefix, self.i)
+
+    def bind(self, prefix, value):
+        name = self.gensym(prefix)
+        self.namespace[name] = value
+        return name
+
+    def generate(self):
+        entry = self.expr(self.plan.root, "v")
+        self.chunks.append("def convert(v):\n    return {}\n".format(entry))
+        return "\n".join(self.chunks)
+
+    def build(self):
+        source = self.generate()
+        logger.debug("generated:\n%s", source)
+        code = compile(source, "<jsonschemawalker.codegen>", "exec")
+        exec(code, self.namespace)
+        fn = self.namespace["convert"]
+        fn.source = source
+        return fn
+
+    def function(self, key, node, emit):
+        try:
+            return self.functions[key]
+        except KeyError:
+            name = self.functions[key] = self.gensym("f")
+            lines = ["def {}(v):".format(name), "    if v is None:", "        return None"]
+            emit(node, lines)
+            self.chunks.append("\n".join(lines) + "\n")
+            return name
+
+    def expr(self, node, var):
+        return getattr(self, node.visitor.replace("walk_", "expr_"))(node, var)
+
+    def expr_any(self, node, var):
+        return var
+
+    def convert_expr(self, node, var):
+        if node.convert is identity:
+            return var
+        return "{}({})".format(self.bind("c", node.convert), var)
+
+    def expr_atom(self, node, var):
+        if self.missing is None and node.convert is identity:
+            return var
+        return "({} if {} is None else {})".format("_missing", var, self.convert_expr(node, var))
+
+    def expr_array(self, node, var):
+        def emit(node, lines):
+            lines.append("    return [{} for x in v]".format(self.expr(node.items, "x")))
+        return "{}({})".format(self.function(("array", id(node)), node, emit), var)
+
+    def expr_one_of(self, node, var):
+        def emit(node, lines):
+            lines.append("    b = {}".format(self.select_expr(node)))
+            keyword = "if"
+            for _, subnode in node.candidates:
+                lines.append("    {} b is {}:".format(keyword, self.bind("n", subnode)))
+                lines.append("        return {}".format(self.expr(subnode, "v")))
+                keyword = "elif"
+        return "{}({})".format(self.function(("one_of", id(node)), node, emit), var)
+
+    def emit_patterns(self, node, lines, get_value, assign):
+        lines.append("    for k in v:")
+        lines.append("        n = {}.match(k)".format(self.bind("o", node)))
+        lines.append("        if n is None:")
+        lines.append("            continue")
+        lines.append("        x = {}".format(get_value))
+        if node.intern is not None:
+            lines.append("        k = {}(k)".format(self.bind("i", node.intern)))
+        keyword = "if"
+        for subnode in list(node.named.values()) + [subnode for _, subnode in node.patterns]:
+            lines.append("        {} n is {}:".format(keyword, self.bind("n", subnode)))
+            assign(lines, "            ", "k", self.expr(subnode, "x"))
+            keyword = "elif"
+        if node.additional is not None:
+            if keyword == "if":
+                assign(lines, "        ", "k", "x")
+            else:
+                lines.append("        else:")
+                assign(lines, "            ", "k", "x")
+
+
+class ToPythonCodeGenerator(CodeGenerator):
+    def __init__(self, plan, wrappers=None, factory=dict, missing=None):
+        super(ToPythonCodeGenerator, self).__init__(plan, factory=factory, missing=missing)
+        self.wrappers = wrappers or {}
+
+    def select_expr(self, node):
+        if node.discriminator is None:
+            return "{}.select(v)".format(self.bind("n", node))
+        return "{}.select(v, v.get({!r}))".format(self.bind("n", node), node.discriminator)
+
+    def expr_atom(self, node, var):
+        if node.default is None:
+            return super(ToPythonCodeGenerator, self).expr_atom(node, var)
+        default = self.bind("d", node.convert(node.default))
+        return "({} if {} is None else {})".format(default, var, self.convert_expr(node, var))
+
+    def expr_reference(self, node, var):
+        target = node.target
+        if target.visitor == "walk_object":
+            return self.object_call(target, var, node.name)
+        return self.expr(target, var)
+
+    def expr_object(self, node, var):
+        return self.object_call(node, var, node.name)
+
+    def object_call(self, node, var, name):
+        wrapper = self.wrappers.get(name)
+
+        def emit(node, lines):
+            if node.properties is None:
+                lines.append("    r = _factory()")
+                self.emit_patterns(node, lines, "v[k]", self.assign)
+            elif wrapper is not None and getattr(wrapper, "_fields", None) == node.keys:
+                # built positionally, without the dict
+                for i, (k, subnode) in enumerate(node.properties):
+                    lines.append("    x{} = v.get({!r})".format(i, k))
+                args = [self.expr(subnode, "x{}".format(i)) for i, (k, subnode) in enumerate(node.properties)]
+                lines.append("    return {}({})".format(self.bind("w", wrapper), ", ".join(args)))
+                return
+            elif self.factory is dict:
+                for i, (k, subnode) in enumerate(node.properties):
+                    lines.append("    x{} = v.get({!r})".format(i, k))
+                items = ["{!r}: {}".format(k, self.expr(subnode, "x{}".format(i)))
+                         for i, (k, subnode) in enumerate(node.properties)]
+                if wrapper is not None:
+                    items.extend("{!r}: None".format(k) for k in node.pruned)
+                lines.append("    r = {{{}}}".format(", ".join(items)))
+            else:
+                lines.append("    r = _factory()")
+                for i, (k, subnode) in enumerate(node.properties):
+                    lines.append("    x = v.get({!r})".format(k))
+                    self.assign(lines, "    ", repr(k), self.expr(subnode, "x"))
+                if wrapper is not None:
+                    for k in node.pruned:
+                        lines.append("    r[{!r}] = None".format(k))
+            if wrapper is None:
+                lines.append("    return r")
+            else:
+                lines.append("    return {}(**r)".format(self.bind("w", wrapper)))
+        return "{}({})".format(self.function(("object", id(node), name), node, emit), var)
+
+    def assign(self, lines, indent, k, expr):
+        lines.append("{}r[{}] = {}".format(indent, k, expr))
+
+
+class ToJSONDictCodeGenerator(CodeGenerator):
+    def __init__(self, plan, getter, verbose=False, missing_value=None, factory=dict, missing=None, branches=None):
+        super(ToJSONDictCodeGenerator, self).__init__(plan, factory=factory, missing=missing)
+        self.verbose = verbose
+        self.namespace["_getter"] = getter
+        self.namespace["_select_branch"] = BranchSelector(getter, missing_value, branches=branches)
+        self.namespace["_missing_value"] = missing_value
+
+    def select_expr(self, node):
+        return "_select_branch({}, v)".format(self.bind("n", node))
+
+    def expr_reference(self, node, var):
+        return self.expr(node.target, var)
+
+    def expr_object(self, node, var):
+        def emit(node, lines):
+            lines.append("    r = _factory()")
+            if node.properties is None:
+                self.emit_patterns(node, lines, "_getter(v, k, _missing_value)", self.assign)
+            else:
+                for k, subnode in node.properties:
+                    lines.append("    x = _getter(v, {!r}, _missing_value)".format(k))
+                    self.assign(lines, "    ", repr(k), self.expr(subnode, "x"))
+            lines.append("    return r")
+        return "{}({})".format(self.function(("object", id(node)), node, emit), var)
+
+    def assign(self, lines, indent, k, expr):
+        if self.verbose:
+            lines.append("{}r[{}] = {}".format(indent, k, expr))
+        else:
+            lines.append("{}if not x == _missing_value:".format(indent))
+            lines.append("{}    r[{}] = {}".format(indent, k, expr))
+
+
+def to_python_function(schema, wrappers=None, factory=dict,
+                       control=None,
+                       converter=Converter(default_json_to_python_mapping)):
+    if isinstance(schema, Plan):
+        check_plan(schema, converter)
+    else:
+        schema = compile_plan(schema, converter=converter, control=control or Control())
+    generator = ToPythonCodeGenerator(schema, wrappers=wrappers, factory=factory, missing=converter.default)
+    return generator.build()
+
+
+def to_jsondict_function(schema, getter=getattr, verbose=False, missing_value=None, factory=dict,
+                         control=None,
+                         converter=Converter(default_python_to_json_mapping),
+                         branches=None):
+    if isinstance(schema, Plan):
+        check_plan(schema, converter)
+    else:
+        schema = compile_plan(schema, converter=converter, control=control or Control())
+    generator = ToJSONDictCodeGenerator(schema, getter, verbose=verbose, missing_value=missing_value,
+                                        factory=factory, missing=converter.default, branches=branches)
+    return generator.build()
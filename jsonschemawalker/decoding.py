@@ -0,0 +1,147 @@
+# -*- coding:utf-8 -*-
+import json
+import re
+from json.decoder import JSONDecodeError, scanstring
+from jsonschemawalker import ToPythonWalker, walker_cache, _wrappers_key
+
+_ws_chars = " \t\n\r"
+_ws = re.compile(r"[ \t\n\r]*").match
+
+
+class Decoder(object):
+    # decodes json text and converts it in the same pass, following the compiled plan.
+    # scalars, untyped subtrees and dropped properties are left to the C scanner of the json module.
+    # the intermediate tree of json.loads is never built, but the parsing loop runs in python,
+    # so this is for memory rather than for speed.
+    def __init__(self, walker):
+        self.walker = walker
+        self.schema = walker.schema
+        self.scan_once = json.JSONDecoder().scan_once
+        self.tables = {}  # object node -> {name: node}
+
+    def __call__(self, s):
+        if isinstance(s, (bytes, bytearray)):
+            s = s.decode(json.detect_encoding(s), "surrogatepass")
+        try:
+            value, end = self.parse(self.walker.plan.root, s, _ws(s, 0).end())
+        except StopIteration as e:
+            raise JSONDecodeError("Expecting value", s, e.value)
+        except IndexError:
+            raise JSONDecodeError("Unexpected end of document", s, len(s))
+        end = _ws(s, end).end()
+        if end != len(s):
+            raise JSONDecodeError("Extra data", s, end)
+        return value
+
+    def parse(self, node, s, i):
+        visitor = node.visitor
+        if visitor == "walk_reference":
+            target = node.target
+            if target.visitor == "walk_object" and s[i] == "{":
+                return self.parse_object(target, s, i, node.name)
+            return self.parse(target, s, i)
+        elif visitor == "walk_object" and s[i] == "{":
+            return self.parse_object(node, s, i, node.name)
+        elif visitor == "walk_array" and s[i] == "[":
+            return self.parse_array(node, s, i)
+        # atoms, untyped values, oneOf/anyOf (the branch is known only after all keys are seen) and nulls
+        value, end = self.scan_once(s, i)
+        return self.walker.walk(node, value), end
+
+    def parse_value(self, node, s, i):
+        visitor = node.visitor
+        if visitor == "walk_atom":
+            value, i = self.scan_once(s, i)
+            return self.walker.walk_atom(node, value), i
+        elif visitor == "walk_any":
+            return self.scan_once(s, i)
+        return self.parse(node, s, i)
+
+    def parse_object(self, node, s, i, name):
+        walker = self.walker
+        scan_once = self.scan_once
+        parse_value = self.parse_value
+        if node.properties is None:
+            found = walker.factory()
+            match = node.match
+        else:
+            found = {}
+            try:
+                match = self.tables[node]
+            except KeyError:
+                match = self.tables[node] = dict(node.properties).get
+        i += 1
+        if s[i] in _ws_chars:
+            i = _ws(s, i).end()
+        if s[i] == "}":
+            i += 1
+        else:
+            while True:
+                if s[i] != '"':
+                    raise JSONDecodeError("Expecting property name enclosed in double quotes", s, i)
+                k, i = scanstring(s, i + 1)
+                if s[i] != ":":
+                    i = _ws(s, i).end()
+                    if s[i] != ":":
+                        raise JSONDecodeError("Expecting ':' delimiter", s, i)
+                i += 1
+                if s[i] in _ws_chars:
+                    i = _ws(s, i).end()
+                subnode = match(k)
+                if subnode is None:
+                    _, i = scan_once(s, i)  # skip
+                else:
+                    found[k], i = parse_value(subnode, s, i)
+                if s[i] in _ws_chars:
+                    i = _ws(s, i).end()
+                c = s[i]
+                i += 1
+                if c == "}":
+                    break
+                elif c != ",":
+                    raise JSONDecodeError("Expecting ',' delimiter", s, i - 1)
+                if s[i] in _ws_chars:
+                    i = _ws(s, i).end()
+        if node.properties is None:
+            return walker.get_wrapper(name, found, node), i
+        r = walker.factory()
+        for k, subnode in node.properties:
+            if k in found:
+                r[k] = found[k]
+            else:
+                r[k] = walker.walk(subnode, None)
+        return walker.get_wrapper(name, r, node), i
+
+    def parse_array(self, node, s, i):
+        items = node.items
+        parse_value = self.parse_value
+        r = []
+        i += 1
+        if s[i] in _ws_chars:
+            i = _ws(s, i).end()
+        if s[i] == "]":
+            return r, i + 1
+        while True:
+            v, i = parse_value(items, s, i)
+            r.append(v)
+            if s[i] in _ws_chars:
+                i = _ws(s, i).end()
+            c = s[i]
+            i += 1
+            if c == "]":
+                return r, i
+            elif c != ",":
+                raise JSONDecodeError("Expecting ',' delimiter", s, i - 1)
+            if s[i] in _ws_chars:
+                i = _ws(s, i).end()
+
+
+def loads(schema, s, wrappers=None, fused=False, decoder=json.loads):
+    # fused=False decodes with `decoder` and then walks the result.
+    # a faster decoder can be passed explicitly (e.g. orjson.loads, that reads integers
+    # wider than 64 bits as floats)
+    if fused:
+        options = (Decoder, _wrappers_key(wrappers))
+        return walker_cache.get(schema, options, lambda: Decoder(ToPythonWalker(schema, wrappers)))(s)
+    options = (ToPythonWalker, _wrappers_key(wrappers))
+    return walker_cache.get(schema, options, lambda: ToPythonWalker(schema, wrappers))(decoder(s))
@@ -0,0 +1,134 @@
+# -*- coding:utf-8 -*-
+import json
+from json.encoder import encode_basestring, encode_basestring_ascii
+from jsonschemawalker import ToJSONDictWalker, walker_cache
+
+
+class Encoder(object):
+    # writes json text while walking, instead of building the dict/list tree of ToJSONDictWalker
+    def __init__(self, walker, ensure_ascii=True, buffer_size=4096):
+        self.walker = walker
+        self.schema = walker.schema
+        self.encode_str = encode_basestring_ascii if ensure_ascii else encode_basestring
+        self.fallback = json.JSONEncoder(ensure_ascii=ensure_ascii)
+        self.buffer_size = buffer_size  # number of fragments collected before each write
+        self.keys = {}  # object node -> [(name, '"name": ', node)]
+
+    def dumps(self, value):
+        out = []
+        self.encode(self.walker.plan.root, value, out, None)
+        return "".join(out)
+
+    def dump(self, value, fp):
+        out = []
+        self.encode(self.walker.plan.root, value, out, fp.write)
+        if out:
+            fp.write("".join(out))
+
+    def encode(self, node, value, out, write):
+        getattr(self, node.visitor.replace("walk_", "encode_"))(node, value, out, write)
+
+    def encode_scalar(self, value, out):
+        if value is None:
+            out.append("null")
+        elif value is True:
+            out.append("true")
+        elif value is False:
+            out.append("false")
+        elif isinstance(value, str):
+            out.append(self.encode_str(value))
+        elif isinstance(value, int):
+            out.append(int.__repr__(value))
+        else:
+            out.append(self.fallback.encode(value))
+
+    def encode_any(self, node, value, out, write):
+        if value is None or isinstance(value, (str, int, bool)):
+            self.encode_scalar(value, out)
+        else:
+            out.append(self.fallback.encode(value))
+
+    def encode_atom(self, node, value, out, write):
+        if value is None:
+            self.encode_scalar(self.walker.converter.default, out)
+        else:
+            self.encode_scalar(node.convert(value), out)
+
+    def encode_reference(self, node, value, out, write):
+        self.encode(node.target, value, out, write)
+
+    def encode_one_of(self, node, value, out, write):
+        self.encode(self.walker.select_branch(node, value), value, out, write)
+
+    def encode_object(self, node, value, out, write):
+        if value is None:
+            out.append("null")
+            return
+        walker = self.walker
+        getter, missing_value, verbose = walker.getter, walker.missing_value, walker.verbose
+        encode_str = self.encode_str
+        if node.properties is None:
+            properties = [(k, "{}: ".format(self.encode_str(k)), subnode) for k, subnode in node.iterate(value)]
+        else:
+            try:
+                properties = self.keys[node]
+            except KeyError:
+                properties = self.keys[node] = [(k, "{}: ".format(self.encode_str(k)), subnode)
+                                                for k, subnode in node.properties]
+        out.append("{")
+        first = True
+        for k, prefix, subnode in properties:
+            raw_val = getter(value, k, missing_value)
+            if raw_val == missing_value and not verbose:
+                continue
+            if first:
+                first = False
+            else:
+                out.append(", ")
+            out.append(prefix)
+            if subnode.visitor == "walk_atom" and raw_val is not None:
+                x = subnode.convert(raw_val)
+                cls = type(x)
+                if cls is str:
+                    out.append(encode_str(x))
+                elif cls is int:
+                    out.append(int.__repr__(x))
+                else:
+                    self.encode_scalar(x, out)
+            else:
+                self.encode(subnode, raw_val, out, write)
+        out.append("}")
+
+    def encode_array(self, node, value, out, write):
+        if value is None:
+            out.append("null")
+            return
+        items = node.items
+        buffer_size = self.buffer_size
+        out.append("[")
+        first = True
+        for v in value:
+            if first:
+                first = False
+            else:
+                out.append(", ")
+            self.encode(items, v, out, write)
+            if write is not None and len(out) >= buffer_size:
+                write("".join(out))
+                del out[:]
+        out.append("]")
+
+
+def _get_encoder(schema, getter, verbose, ensure_ascii):
+    options = (Encoder, getter, verbose, ensure_ascii)
+    return walker_cache.get(schema, options,
+                            lambda: Encoder(ToJSONDictWalker(schema, getter, verbose=verbose), ensure_ascii=ensure_ascii))
+
+
+def dumps(schema, obj, getter=getattr, verbose=False, ensure_ascii=True):
+    return _get_encoder(schema, getter, verbose, ensure_ascii).dumps(obj)
+
+
+def dump(schema, obj, fp, getter=getattr, verbose=False, ensure_ascii=True):
+    # large arrays are written in chunks, as they are walked
+    _get_encoder(schema, getter, verbose, ensure_ascii).dump(obj, fp)
@@ -0,0 +1,197 @@
+# -*- coding:utf-8 -*-
+from jsonschemawalker import ToPythonWalker, ToJSONDictWalker, walker_cache, _wrappers_key
+
+# the walkers of this module keep pending work on an explicit stack instead of the python stack,
+# so the depth of a document is not limited by sys.getrecursionlimit().
+# atoms and untyped values are converted in place; only objects and arrays are pushed.
+# the work is done by a generator, that can also pause every `every` nodes.
+
+_finish = object()  # marker of a stack entry calling a wrapper after its properties are converted
+
+
+def run(steps):
+    try:
+        while True:
+            next(steps)
+    except StopIteration as e:
+        return e.value
+
+
+def python_steps(walker, node, value, every=None):
+    # the same conversion as ToPythonWalker.walk(node, value)
+    wrappers = walker.wrappers
+    factory = walker.factory
+    missing = walker.converter.default
+    holder = [None]
+    stack = [(node, value, holder, 0)]
+    pop, push = stack.pop, stack.append
+    count = 0
+    every = every or 0
+    while stack:
+        node, value, parent, key = pop()
+        if node is _finish:
+            parent[key] = walker.get_wrapper(*value)  # (name, params, node)
+            continue
+        if every:
+            count += 1
+            if count >= every:
+                count = 0
+                yield
+
+        # $ref and oneOf/anyOf are resolved to the node that is actually walked
+        name = None
+        visitor = node.visitor
+        while True:
+            if visitor == "walk_reference":
+                target = node.target
+                name = node.name if target.visitor == "walk_object" else None
+                node = target
+            elif visitor == "walk_one_of":
+                tag = value.get(node.discriminator) if node.discriminator is not None else None
+                node = node.select(value, tag)
+                name = None
+            else:
+                break
+            visitor = node.visitor
+
+        if value is None and visitor != "walk_atom":
+            parent[key] = None
+        elif visitor == "walk_object":
+            r = factory()
+            name = name or node.name
+            if name in wrappers:
+                push((_finish, (name, r, node), parent, key))
+            else:
+                parent[key] = r
+            if node.properties is None:
+                properties, get = node.iterate(value), value.__getitem__
+            else:
+                properties, get = node.properties, value.get
+            deferred = []
+            for k, subnode in properties:
+                v = get(k)
+                subvisitor = subnode.visitor
+                if subvisitor == "walk_atom":
+                    if v is None:
+                        v = subnode.default
+                        r[k] = missing if v is None else subnode.convert(v)
+                    else:
+                        r[k] = subnode.convert(v)
+                elif subvisitor == "walk_any":
+                    r[k] = v
+                else:
+                    r[k] = None  # keeps the order of keys
+                    deferred.append((subnode, v, r, k))
+            if deferred:
+                stack.extend(reversed(deferred))
+        elif visitor == "walk_array":
+            parent[key] = _push_items(walker, node.items, value, push) if value else []
+        else:
+            parent[key] = getattr(walker, visitor)(node, value)
+    return holder[0]
+
+
+def jsondict_steps(walker, node, value, every=None):
+    # the same conversion as ToJSONDictWalker.walk(node, value)
+    factory = walker.factory
+    getter, missing_value, verbose = walker.getter, walker.missing_value, walker.verbose
+    select_branch = walker.select_branch
+    missing = walker.converter.default
+    holder = [None]
+    stack = [(node, value, holder, 0)]
+    pop, push = stack.pop, stack.append
+    count = 0
+    every = every or 0
+    while stack:
+        node, value, parent, key = pop()
+        if every:
+            count += 1
+            if count >= every:
+                count = 0
+                yield
+
+        visitor = node.visitor
+        while True:
+            if visitor == "walk_reference":
+                node = node.target
+            elif visitor == "walk_one_of":
+                node = select_branch(node, value)
+            else:
+                break
+            visitor = node.visitor
+
+        if value is None and visitor != "walk_atom":
+            parent[key] = None
+        elif visitor == "walk_object":
+            r = parent[key] = factory()
+            if node.properties is None:
+                properties = node.iterate(value)
+            else:
+                properties = node.properties
+            deferred = []
+            for k, subnode in properties:
+                v = getter(value, k, missing_value)
+                if v == missing_value and not verbose:
+                    continue
+                subvisitor = subnode.visitor
+                if subvisitor == "walk_atom":
+                    r[k] = missing if v is None else subnode.convert(v)
+                elif subvisitor == "walk_any":
+                    r[k] = v
+                else:
+                    r[k] = None  # keeps the order of keys
+                    deferred.append((subnode, v, r, k))
+            if deferred:
+                stack.extend(reversed(deferred))
+        elif visitor == "walk_array":
+            parent[key] = _push_items(walker, node.items, value, push) if value else []
+        else:
+            parent[key] = getattr(walker, visitor)(node, value)
+    return holder[0]
+
+
+def _push_items(walker, items, value, push):
+    visitor = items.visitor
+    if visitor == "walk_atom":
+        return [walker.walk_atom(items, v) for v in value]
+    elif visitor == "walk_any":
+        return list(value)
+    if not isinstance(value, list):
+        value = list(value)
+    r = [None] * len(value)
+    for i in range(len(value) - 1, -1, -1):
+        push((items, value[i], r, i))
+    return r
+
+
+class IterativeToPythonWalker(ToPythonWalker):
+    def __call__(self, value):
+        return run(python_steps(self, self.plan.root, value))
+
+    def walk(self, node, value):
+        return run(python_steps(self, node, value))
+
+    def steps(self, value, every=None):
+        return python_steps(self, self.plan.root, value, every=every)
+
+
+class IterativeToJSONDictWalker(ToJSONDictWalker):
+    def __call__(self, value):
+        return run(jsondict_steps(self, self.plan.root, value))
+
+    def walk(self, node, value):
+        return run(jsondict_steps(self, node, value))
+
+    def steps(self, value, every=None):
+        return jsondict_steps(self, self.plan.root, value, every=every)
+
+
+def to_python_iterative(schema, data, wrappers=None):
+    options = (IterativeToPythonWalker, _wrappers_key(wrappers))
+    return walker_cache.get(schema, options, lambda: IterativeToPythonWalker(schema, wrappers))(data)
+
+
+def to_jsondict_iterative(schema, data, getter=getattr, verbose=False):
+    options = (IterativeToJSONDictWalker, getter, verbose)
+    return walker_cache.get(schema, options,
+                            lambda: IterativeToJSONDictWalker(schema, getter, verbose=verbose))(data)
@@ -0,0 +1,131 @@
+# -*- coding:utf-8 -*-
+from collections.abc import Mapping, Sequence
+from jsonschemawalker import ToPythonWalker, walker_cache, _wrappers_key
+
+_missing = object()
+
+
+class LazyObject(Mapping):
+    # converts each property on first access
+    __slots__ = ("_walker", "_node", "_value", "_cache")
+
+    def __init__(self, walker, node, value):
+        self._walker = walker
+        self._node = node
+        self._value = value
+        self._cache = {}
+
+    def __getitem__(self, k):
+        v = self._cache.get(k, _missing)
+        if v is not _missing:
+            return v
+        node = self._node
+        if node.properties is None:
+            subnode = node.match(k) if k in self._value else None
+            if subnode is None:
+                raise KeyError(k)
+            raw = self._value[k]
+        else:
+            subnode = self._walker.get_properties(node).get(k)
+            if subnode is None:
+                raise KeyError(k)
+            raw = self._value.get(k)
+        v = self._cache[k] = self._walker.walk(subnode, raw)
+        return v
+
+    def __iter__(self):
+        node = self._node
+        if node.properties is None:
+            for k, _ in node.iterate(self._value):
+                yield k
+        else:
+            for k, _ in node.properties:
+                yield k
+
+    def __len__(self):
+        if self._node.properties is None:
+            return sum(1 for _ in self._node.iterate(self._value))
+        return len(self._node.properties)
+
+    def __repr__(self):
+        return "<LazyObject {} converted={}>".format(self._node.path, sorted(self._cache.keys()))
+
+    def materialize(self):
+        r = self._walker.factory()
+        for k in self:
+            r[k] = materialize(self[k])
+        return r
+
+
+class LazyArray(Sequence):
+    # converts each element on first access
+    __slots__ = ("_walker", "_node", "_value", "_cache")
+
+    def __init__(self, walker, node, value):
+        self._walker = walker
+        self._node = node
+        self._value = value
+        self._cache = [_missing] * len(value)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        v = self._cache[i]
+        if v is _missing:
+            v = self._cache[i] = self._walker.walk(self._node.items, self._value[i])
+        return v
+
+    def __len__(self):
+        return len(self._value)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(x == y for x, y in zip(self, other))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "<LazyArray {} size={}>".format(self._node.path, len(self))
+
+    def materialize(self):
+        return [materialize(x) for x in self]
+
+
+def materialize(value):
+    if isinstance(value, (LazyObject, LazyArray)):
+        return value.materialize()
+    return value
+
+
+class LazyToPythonWalker(ToPythonWalker):
+    # objects and arrays are returned as proxies. objects having a wrapper are built eagerly
+    # (their properties are still lazy), because wrapper(**params) needs every field
+    def __init__(self, *args, **kwargs):
+        super(LazyToPythonWalker, self).__init__(*args, **kwargs)
+        self.tables = {}  # object node -> {name: node}
+
+    def get_properties(self, node):
+        try:
+            return self.tables[node]
+        except KeyError:
+            table = self.tables[node] = dict(node.properties)
+            return table
+
+    def walk_object(self, node, value, name=None):
+        if value is None:
+            return None
+        if (name or node.name) in self.wrappers:
+            return super(LazyToPythonWalker, self).walk_object(node, value, name=name)
+        return LazyObject(self, node, value)
+
+    def walk_array(self, node, value):
+        if value is None:
+            return None
+        return LazyArray(self, node, value)
+
+
+def to_python_lazy(schema, data, wrappers=None):
+    options = (LazyToPythonWalker, _wrappers_key(wrappers))
+    return walker_cache.get(schema, options, lambda: LazyToPythonWalker(schema, wrappers))(data)
@@ -0,0 +1,94 @@
+# -*- coding:utf-8 -*-
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from jsonschemawalker import ToPythonWalker, ToJSONDictWalker, walker_cache, _wrappers_key
+
+# the walker of a worker process, built once by the initializer
+_walker = None
+
+
+def _initialize(cls, schema, kwargs):
+    global _walker
+    _walker = cls(schema, **kwargs)
+
+
+def _convert_chunk(chunk):
+    return _walker.many(chunk)
+
+
+def chunked(iterable, chunksize):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_chunks(executor, fn, chunks, ordered=True, window=None):
+    # at most `window` chunks are in flight, so the input is consumed lazily
+    window = window or 2 * (getattr(executor, "_max_workers", None) or 1)
+    chunks = iter(chunks)
+    pending = deque()
+    for chunk in itertools.islice(chunks, window):
+        pending.append(executor.submit(fn, chunk))
+    if ordered:
+        while pending:
+            result = pending.popleft().result()
+            for chunk in itertools.islice(chunks, 1):
+                pending.append(executor.submit(fn, chunk))
+            for x in result:
+                yield x
+    else:
+        pending = set(pending)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for chunk in itertools.islice(chunks, len(done)):
+                pending.add(executor.submit(fn, chunk))
+            for future in done:
+                for x in future.result():
+                    yield x
+
+
+def _parallel(cls, schema, kwargs, iterable, workers, chunksize, ordered):
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_initialize, initargs=(cls, schema, kwargs))
+    try:
+        for x in convert_chunks(executor, _convert_chunk, chunked(iterable, chunksize), ordered=ordered):
+            yield x
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def to_python_parallel(schema, iterable, workers=None, chunksize=1000, ordered=True, wrappers=None):
+    # schema and wrappers are pickled to each worker process
+    kwargs = {"wrappers": wrappers}
+    return _parallel(ToPythonWalker, schema, kwargs, iterable, workers, chunksize, ordered)
+
+
+def to_jsondict_parallel(schema, iterable, workers=None, chunksize=1000, ordered=True, getter=getattr, verbose=False):
+    kwargs = {"getter": getter, "verbose": verbose}
+    return _parallel(ToJSONDictWalker, schema, kwargs, iterable, workers, chunksize, ordered)
+
+
+def _threaded(walker, iterable, workers, chunksize, ordered):
+    # one walker (and one compiled plan) is shared by the threads.
+    # this is worth it on free-threaded builds, or when wrappers/getters release the GIL
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for x in convert_chunks(executor, walker.many, chunked(iterable, chunksize), ordered=ordered):
+            yield x
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def to_python_threaded(schema, iterable, workers=None, chunksize=1000, ordered=True, wrappers=None):
+    options = (ToPythonWalker, _wrappers_key(wrappers), None)
+    walker = walker_cache.get(schema, options, lambda: ToPythonWalker(schema, wrappers))
+    return _threaded(walker, iterable, workers, chunksize, ordered)
+
+
+def to_jsondict_threaded(schema, iterable, workers=None, chunksize=1000, ordered=True, getter=getattr, verbose=False):
+    options = (ToJSONDictWalker, getter, verbose, None)
+    walker = walker_cache.get(schema, options, lambda: ToJSONDictWalker(schema, getter, verbose=verbose))
+    return _threaded(walker, iterable, workers, chunksize, ordered)
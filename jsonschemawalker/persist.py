@@ -0,0 +1,171 @@
+# -*- coding:utf-8 -*-
+import hashlib
+import logging
+import os
+import pickle
+from jsonschemawalker import (
+    __version__,
+    ObjectNode,
+    ArrayNode,
+    RefNode,
+    OneOfNode,
+    Control,
+    Converter,
+    RefResolver,
+    default_json_to_python_mapping,
+    compile,
+    _fingerprint,
+)
+from jsonschemawalker.resolver import load_file
+logger = logging.getLogger(__name__)
+
+# compiled plans (resolved refs, merged allOf, selected converters) saved with pickle.
+# a cache file is keyed by the schema (its content, or its path) and the converter, and is stale when
+# the library version or any schema file it was compiled from has changed.
+# compiled regexps are pickled as their patterns, so they are compiled again on load.
+
+
+def converter_key(converter):
+    mapping = sorted((repr(k), "{}.{}".format(getattr(v, "__module__", ""), getattr(v, "__qualname__", repr(v))))
+                     for k, v in converter.mapping.items())
+    interner = None if converter.interner is None else converter.interner.maxsize
+    return repr((mapping, repr(converter.default), converter.kindly, interner))
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _local_path(uri):
+    if uri.startswith("file://"):
+        uri = uri[len("file://"):]
+    if "://" in uri or not uri or not os.path.isfile(uri):
+        return None
+    return os.path.abspath(uri)
+
+
+def _stat(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _children(node):
+    if isinstance(node, ObjectNode):
+        children = [subnode for _, subnode in node.properties or ()]
+        children.extend(node.named.values())
+        children.extend(subnode for _, subnode in node.patterns)
+        if node.additional is not None:
+            children.append(node.additional)
+        return children
+    elif isinstance(node, ArrayNode):
+        return [node.items]
+    elif isinstance(node, RefNode):
+        return [node.target]
+    elif isinstance(node, OneOfNode):
+        return [subnode for _, subnode in node.candidates]
+    return []
+
+
+def iterate_nodes(plan):
+    # children before their parents. pickled in this order, each node finds its children already
+    # memoized, so long $ref chains and deep schemas do not hit the recursion limit of pickle
+    seen = set()
+    roots = [plan.root] + list(plan.references.values())
+    for root in roots:
+        if id(root) in seen:
+            continue
+        seen.add(id(root))
+        stack = [(root, iter(_children(root)))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append((child, iter(_children(child))))
+                    break
+            else:
+                stack.pop()
+                yield node
+
+
+class PlanCache(object):
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_of(self, key):
+        return os.path.join(self.directory, "{}.plan".format(key))
+
+    def load(self, key):
+        try:
+            with open(self.path_of(key), "rb") as rf:
+                entry = pickle.load(rf)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            logger.debug("plan cache miss %s: %r", key, e)
+            return None
+        if self.is_stale(entry):
+            logger.debug("plan cache stale %s", key)
+            return None
+        return entry["plan"]
+
+    def is_stale(self, entry):
+        if entry.get("version") != __version__:
+            return True
+        for path, stat in entry.get("files", ()):
+            try:
+                if _stat(path) != stat:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def save(self, key, plan, resolver=None):
+        files = []
+        if resolver is not None:
+            for uri in sorted(resolver.store.keys()):
+                path = _local_path(uri)
+                if path is not None:
+                    files.append((path, _stat(path)))
+        entry = {"version": __version__, "files": files, "nodes": list(iterate_nodes(plan)), "plan": plan}
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_of(key)
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp, "wb") as wf:
+                pickle.dump(entry, wf, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            # e.g. lambdas in the mapping, or interned converters (closures). the plan is used uncached
+            logger.debug("plan cache not saved %s: %r", key, e)
+            os.remove(tmp)
+            return False
+        os.replace(tmp, path)  # readers never see a partial file
+        return True
+
+
+def cached_compile(schema, directory, converter=None, control=None, resolver=None):
+    # keyed by the content of the schema. external schema files referenced from it are checked for staleness
+    converter = converter or Converter(default_json_to_python_mapping)
+    cache = PlanCache(directory)
+    key = _digest(__version__, _fingerprint(schema), converter_key(converter))
+    plan = cache.load(key)
+    if plan is None:
+        resolver = resolver or RefResolver(schema)
+        plan = compile(schema, converter=converter, control=control or Control(), resolver=resolver)
+        cache.save(key, plan, resolver)
+    return plan
+
+
+def cached_compile_file(path, directory, converter=None, control=None, loader=load_file):
+    # keyed by the path, so a fresh cache is loaded without reading or parsing the schema files
+    converter = converter or Converter(default_json_to_python_mapping)
+    cache = PlanCache(directory)
+    key = _digest(__version__, os.path.abspath(path), converter_key(converter))
+    plan = cache.load(key)
+    if plan is None:
+        resolver = RefResolver.from_file(path, loader=loader)
+        plan = compile(resolver.schema, converter=converter, control=control or Control(), resolver=resolver)
+        cache.save(key, plan, resolver)
+    return plan
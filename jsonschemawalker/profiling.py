@@ -0,0 +1,136 @@
+# -*- coding:utf-8 -*-
+import time
+from collections import namedtuple
+from jsonschemawalker import ToPythonWalker, ToJSONDictWalker, walker_cache
+
+# instrumented walkers. the plain walkers are not touched, so profiling costs nothing when it is not used.
+# times are cumulative (a path includes the time of its subtree)
+
+Stat = namedtuple("Stat", "count time")
+
+
+class Profile(object):
+    def __init__(self):
+        self.paths = {}  # json pointer of the schema -> [count, seconds]
+        self.converters = {}  # name of convert function -> [count, seconds]
+        self.hits = {}  # cache name -> [hits, misses]
+
+    def add(self, table, k, count, elapsed):
+        try:
+            stat = table[k]
+        except KeyError:
+            stat = table[k] = [0, 0.0]
+        stat[0] += count
+        stat[1] += elapsed
+
+    def hit(self, k, hit):
+        try:
+            stat = self.hits[k]
+        except KeyError:
+            stat = self.hits[k] = [0, 0]
+        stat[0 if hit else 1] += 1
+
+    def stats(self, table):
+        # sorted by time, slowest first
+        return sorted(((k, Stat(*v)) for k, v in table.items()), key=lambda x: -x[1].time)
+
+    def hit_rates(self):
+        return {k: (hits / float(hits + misses) if hits + misses else 0.0) for k, (hits, misses) in self.hits.items()}
+
+    def report(self, limit=20):
+        lines = ["{:>10} {:>12}  path".format("count", "cumtime")]
+        for k, stat in self.stats(self.paths)[:limit]:
+            lines.append("{:>10} {:>12.6f}  {}".format(stat.count, stat.time, k))
+        lines.append("{:>10} {:>12}  converter".format("count", "cumtime"))
+        for k, stat in self.stats(self.converters)[:limit]:
+            lines.append("{:>10} {:>12.6f}  {}".format(stat.count, stat.time, k))
+        lines.append("{:>10} {:>12}  cache".format("hits", "misses"))
+        for k, (hits, misses) in sorted(self.hits.items()):
+            lines.append("{:>10} {:>12}  {}".format(hits, misses, k))
+        return "\n".join(lines)
+
+    def clear(self):
+        self.paths.clear()
+        self.converters.clear()
+        self.hits.clear()
+
+
+def converter_name(convert):
+    convert = getattr(convert, "convert", convert)  # interned
+    return getattr(convert, "__qualname__", None) or getattr(convert, "__name__", None) or repr(convert)
+
+
+class ProfilingMixin(object):
+    # `callback(path, seconds)` is called for each node, if given
+    def setup_profile(self, profile, callback):
+        self.profile = profile or Profile()
+        self.callback = callback
+        self.clock = time.perf_counter
+
+    def walk(self, node, value):
+        start = self.clock()
+        r = getattr(self, node.visitor)(node, value)
+        elapsed = self.clock() - start
+        self.profile.add(self.profile.paths, node.path, 1, elapsed)
+        if node.visitor == "walk_atom":
+            self.profile.add(self.profile.converters, converter_name(node.convert), 1, elapsed)
+        if self.callback is not None:
+            self.callback(node.path, elapsed)
+        return r
+
+    def walk_many(self, node, values):
+        start = self.clock()
+        r = getattr(self, node.visitor + "_many")(node, values)
+        elapsed = self.clock() - start
+        self.profile.add(self.profile.paths, node.path, len(values), elapsed)
+        if node.visitor == "walk_atom":
+            self.profile.add(self.profile.converters, converter_name(node.convert), len(values), elapsed)
+        if self.callback is not None:
+            self.callback(node.path, elapsed)
+        return r
+
+    def count_keys(self, node, value):
+        # decisions of patternProperties, per key
+        if node.properties is None and value is not None:
+            for k in value:
+                self.profile.hit("pattern", k in node.decisions)
+
+    def caches(self):
+        # cache statistics of the compile step and of the walker cache (functools-like CacheInfo)
+        info = self.control.info()
+        info["walkers"] = walker_cache.info()
+        info["references"] = len(self.plan.references)
+        return info
+
+
+class ProfilingToPythonWalker(ProfilingMixin, ToPythonWalker):
+    def __init__(self, *args, **kwargs):
+        profile = kwargs.pop("profile", None)
+        callback = kwargs.pop("callback", None)
+        super(ProfilingToPythonWalker, self).__init__(*args, **kwargs)
+        self.setup_profile(profile, callback)
+
+    def walk_one_of(self, node, value):
+        tag = value.get(node.discriminator) if node.discriminator is not None else None
+        self.profile.hit("branch", (tag is not None and tag in node.tags) or tuple(value) in node.decisions)
+        return super(ProfilingToPythonWalker, self).walk_one_of(node, value)
+
+    def walk_object(self, node, value, name=None):
+        self.count_keys(node, value)
+        return super(ProfilingToPythonWalker, self).walk_object(node, value, name=name)
+
+
+class ProfilingToJSONDictWalker(ProfilingMixin, ToJSONDictWalker):
+    def __init__(self, *args, **kwargs):
+        profile = kwargs.pop("profile", None)
+        callback = kwargs.pop("callback", None)
+        super(ProfilingToJSONDictWalker, self).__init__(*args, **kwargs)
+        self.setup_profile(profile, callback)
+
+    def walk_one_of(self, node, value):
+        self.profile.hit("branch", (node, type(value)) in self.select_branch.cache)
+        return super(ProfilingToJSONDictWalker, self).walk_one_of(node, value)
+
+    def walk_object(self, node, value):
+        self.count_keys(node, value)
+        return super(ProfilingToJSONDictWalker, self).walk_object(node, value)
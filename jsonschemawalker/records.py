@@ -0,0 +1,97 @@
+# -*- coding:utf-8 -*-
+import keyword
+from jsonschemawalker import Plan, ObjectNode, RefNode, ArrayNode, OneOfNode, compile
+
+# record classes are plain classes with __slots__, laid out like namedtuple (`_fields` in property order).
+# the walkers build them positionally, instead of building a dict and calling wrapper(**params).
+
+# `_self`, as underscore names are never fields (a property may be called "self")
+_template = """\
+def __init__(_self, {args}):
+{body}
+"""
+
+
+def _valid_field(name):
+    return name.isidentifier() and not keyword.iskeyword(name) and not name.startswith("_")
+
+
+def _repr(self):
+    return "{}({})".format(self.__class__.__name__,
+                           ", ".join("{}={!r}".format(k, getattr(self, k)) for k in self._fields))
+
+
+def _eq(self, other):
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    return all(getattr(self, k) == getattr(other, k) for k in self._fields)
+
+
+def _asdict(self):
+    return {k: getattr(self, k) for k in self._fields}
+
+
+def _iter(self):
+    for k in self._fields:
+        yield getattr(self, k)
+
+
+def record_class(name, fields, module=None):
+    fields = tuple(fields)
+    for k in fields:
+        if not _valid_field(k):
+            raise ValueError("{!r} is not a valid field name of {}".format(k, name))
+    namespace = {}
+    body = "\n".join("    _self.{0} = {0}".format(k) for k in fields) or "    pass"
+    exec(_template.format(args=", ".join(fields), body=body), namespace)
+    attrs = {
+        "__slots__": fields,
+        "_fields": fields,
+        "__init__": namespace["__init__"],
+        "__repr__": _repr,
+        "__eq__": _eq,
+        "__hash__": None,
+        "__iter__": _iter,
+        "_asdict": _asdict,
+    }
+    if module is not None:
+        attrs["__module__"] = module
+    return type(str(name), (object,), attrs)
+
+
+def iterate_objects(plan):
+    # (name, object node) of each titled object or referenced definition having fixed properties
+    seen = set()
+    stack = [(None, plan.root)] + [(None, node) for node in plan.references.values()]
+    while stack:
+        name, node = stack.pop()
+        if isinstance(node, RefNode):
+            stack.append((node.name, node.target))
+            continue
+        if (name, id(node)) in seen:
+            continue
+        seen.add((name, id(node)))
+        if isinstance(node, ObjectNode):
+            if node.keys is not None and (name or node.name):
+                yield name or node.name, node
+            if node.properties is not None:
+                stack.extend((None, subnode) for _, subnode in node.properties)
+            else:
+                stack.extend((None, subnode) for subnode in node.named.values())
+                stack.extend((None, subnode) for _, subnode in node.patterns)
+        elif isinstance(node, ArrayNode):
+            stack.append((None, node.items))
+        elif isinstance(node, OneOfNode):
+            stack.extend((None, subnode) for _, subnode in node.candidates)
+
+
+def record_classes(schema, module=None):
+    # wrappers for to_python(), {name: record class}.
+    # objects whose property names are not identifiers are left as dicts
+    plan = schema if isinstance(schema, Plan) else compile(schema)
+    classes = {}
+    for name, node in iterate_objects(plan):
+        if name in classes or not all(_valid_field(k) for k in node.keys):
+            continue
+        classes[name] = record_class(name, node.keys, module=module)
+    return classes
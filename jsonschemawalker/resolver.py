@@ -0,0 +1,110 @@
+# -*- coding:utf-8 -*-
+import json
+import logging
+from urllib.parse import urljoin, unquote
+logger = logging.getLogger(__name__)
+
+
+def escape(token):
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def resolve_pointer(doc, pointer):
+    # pointer is a fragment such as "#/definitions/User" or "/definitions/User"
+    target = doc
+    for k in pointer.lstrip("#").split("/")[1:]:
+        k = unescape(k)
+        if isinstance(target, list):
+            k = int(k)
+        target = target[k]
+    return target
+
+
+def index_pointers(doc):
+    # every addressable location in doc, keyed by its (escaped) json pointer
+    index = {"": doc}
+    stack = [("", doc)]
+    while stack:
+        prefix, target = stack.pop()
+        if isinstance(target, dict):
+            items = target.items()
+        elif isinstance(target, list):
+            items = enumerate(target)
+        else:
+            continue
+        for k, v in items:
+            pointer = "{}/{}".format(prefix, escape(str(k)))
+            index[pointer] = v
+            stack.append((pointer, v))
+    return index
+
+
+def rebase_refs(schema, uri):
+    # a copy of schema whose $refs are absolute, for embedding it in a document of another uri
+    if isinstance(schema, dict):
+        r = dict((k, rebase_refs(v, uri)) for k, v in schema.items())
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            r["$ref"] = uri + ref if ref.startswith("#") else urljoin(uri, ref)
+        return r
+    elif isinstance(schema, list):
+        return [rebase_refs(v, uri) for v in schema]
+    return schema
+
+
+def load_file(uri):
+    if uri.startswith("file://"):
+        uri = uri[len("file://"):]
+    logger.debug("load %s", uri)
+    with open(uri) as rf:
+        return json.load(rf)
+
+
+class RefResolver(object):
+    def __init__(self, schema, base_uri="", loader=load_file, store=None):
+        self.schema = schema
+        self.base_uri = base_uri
+        self.loader = loader
+        # uri -> document. can be shared between resolvers as a document cache
+        self.store = {} if store is None else store
+        self.store[base_uri] = schema
+        self.indexes = {}  # uri -> {pointer: node}
+
+    @classmethod
+    def from_file(cls, path, loader=load_file, store=None):
+        return cls(loader(path), base_uri=path, loader=loader, store=store)
+
+    def get_document(self, uri):
+        try:
+            return self.store[uri]
+        except KeyError:
+            doc = self.store[uri] = self.loader(uri)
+            return doc
+
+    def get_index(self, uri):
+        try:
+            return self.indexes[uri]
+        except KeyError:
+            index = self.indexes[uri] = index_pointers(self.get_document(uri))
+            return index
+
+    def canonical(self, ref, base_uri=None):
+        # -> (document uri, json pointer)
+        if base_uri is None:
+            base_uri = self.base_uri
+        if ref.startswith("#"):
+            uri, fragment = base_uri, ref[1:]
+        else:
+            uri, _, fragment = urljoin(base_uri, ref).partition("#")
+        return uri, unquote(fragment)
+
+    def resolve(self, ref, base_uri=None):
+        uri, pointer = self.canonical(ref, base_uri)
+        try:
+            return uri, self.get_index(uri)[pointer]
+        except KeyError:
+            raise KeyError("unresolvable reference: {!r} (base={!r})".format(ref, base_uri))
@@ -0,0 +1,163 @@
+# -*- coding:utf-8 -*-
+import codecs
+import json
+import re
+from jsonschemawalker import ToPythonWalker, AnyNode, ArrayNode, ObjectNode, RefNode
+from jsonschemawalker.resolver import unescape
+
+_ws_rx = re.compile(r"[ \t\n\r]*")
+_numeric = frozenset("0123456789+-.eE")
+
+
+def iter_chunks(source, chunk_size=65536):
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in source:
+            yield chunk
+
+
+class Scanner(object):
+    # incremental reader of a json document. only the current value is held in memory
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.bytes_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def fill(self):
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.eof = True
+            return False
+        if isinstance(chunk, bytes):
+            chunk = self.bytes_decoder.decode(chunk)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buf, self.pos)
+
+    def peek(self):
+        while True:
+            self.pos = _ws_rx.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise self.error("Unexpected end of document")
+
+    def expect(self, c):
+        if self.peek() != c:
+            raise self.error("Expecting {!r}".format(c))
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        n = 1
+        while True:
+            try:
+                v, end = self.decoder.raw_decode(self.buf, self.pos)
+                # a number is complete only if a non-numeric character follows it
+                if self.eof or (end < len(self.buf) and self.buf[end] not in _numeric):
+                    self.pos = end
+                    return v
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # read exponentially more before retrying, so that a large value is not re-parsed too often
+            for _ in range(n):
+                if not self.fill():
+                    break
+            n *= 2
+
+    def seek(self, segments):
+        for segment in segments:
+            c = self.peek()
+            if c == "{":
+                self.pos += 1
+                while True:
+                    if self.peek() == "}":
+                        raise KeyError(segment)
+                    key = self.value()
+                    self.expect(":")
+                    if key == segment:
+                        break
+                    self.value()  # skip
+                    if self.peek() == ",":
+                        self.pos += 1
+            elif c == "[":
+                self.pos += 1
+                for _ in range(int(segment)):
+                    self.value()  # skip
+                    self.expect(",")
+            else:
+                raise self.error("Expecting object or array")
+
+    def iterate(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            c = self.peek()
+            self.pos += 1
+            if c == "]":
+                return
+            elif c != ",":
+                self.pos -= 1
+                raise self.error("Expecting ',' delimiter")
+
+
+def split_pointer(pointer):
+    pointer = pointer.lstrip("#")
+    if not pointer:
+        return []
+    return [unescape(k) for k in pointer.split("/")[1:]]
+
+
+def node_at(node, segments):
+    for segment in segments:
+        while isinstance(node, RefNode):
+            node = node.target
+        if isinstance(node, ObjectNode):
+            if node.properties is None:
+                node = node.match(segment)
+            else:
+                node = dict(node.properties).get(segment)
+            if node is None:
+                raise KeyError(segment)
+        elif isinstance(node, ArrayNode):
+            node = node.items
+        elif not isinstance(node, AnyNode):
+            raise ValueError("cannot follow {!r} at {}".format(segment, node.path))
+    while isinstance(node, RefNode):
+        node = node.target
+    return node
+
+
+def iter_array(source, pointer="", chunk_size=65536):
+    scanner = Scanner(iter_chunks(source, chunk_size))
+    scanner.seek(split_pointer(pointer))
+    return scanner.iterate()
+
+
+def iter_python(schema, source, pointer="", wrappers=None, chunk_size=65536):
+    # converts each element of the array at `pointer` (a json pointer into the document)
+    walker = ToPythonWalker(schema, wrappers)
+    node = node_at(walker.plan.root, split_pointer(pointer))
+    if isinstance(node, ArrayNode):
+        node = node.items
+    elif not isinstance(node, AnyNode):
+        raise ValueError("{} is not an array".format(node.path))
+    walk = walker.walk
+    for v in iter_array(source, pointer, chunk_size=chunk_size):
+        yield walk(node, v)
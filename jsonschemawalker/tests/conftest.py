@@ -0,0 +1,108 @@
+# -*- coding:utf-8 -*-
+import json
+import pytest
+
+# the walker suites (test_to_python, test_to_jsondict) use the `backend` fixture, and are run against
+# each backend. only the tests calling the module's _callFUT are parametrized, the others run once
+
+
+def _to_python_many(schema, data, wrappers=None):
+    from jsonschemawalker import to_python_many
+    result = to_python_many(schema, [data, data], wrappers)
+    assert result[0] == result[1]
+    return result[0]
+
+
+def _to_jsondict_many(schema, data, getter=getattr, verbose=False):
+    from jsonschemawalker import to_jsondict_many
+    result = to_jsondict_many(schema, [data, data], getter=getter, verbose=verbose)
+    assert result[0] == result[1]
+    return result[0]
+
+
+def _to_python_codegen(schema, data, wrappers=None):
+    from jsonschemawalker.codegen import to_python_function
+    return to_python_function(schema, wrappers)(data)
+
+
+def _to_jsondict_codegen(schema, data, getter=getattr, verbose=False):
+    from jsonschemawalker.codegen import to_jsondict_function
+    return to_jsondict_function(schema, getter=getter, verbose=verbose)(data)
+
+
+def _loads(schema, data, wrappers=None):
+    from jsonschemawalker.decoding import loads
+    return loads(schema, json.dumps(data, indent=1), wrappers)
+
+
+def _loads_fused(schema, data, wrappers=None):
+    from jsonschemawalker.decoding import loads
+    return loads(schema, json.dumps(data, indent=1), wrappers, fused=True)
+
+
+def _dumps(schema, data, getter=getattr, verbose=False):
+    from jsonschemawalker import to_jsondict
+    from jsonschemawalker.encoding import dumps
+    text = dumps(schema, data, getter=getter, verbose=verbose)
+    assert text == json.dumps(to_jsondict(schema, data, getter=getter, verbose=verbose))
+    return json.loads(text)
+
+
+def _to_python_lazy(schema, data, wrappers=None):
+    from jsonschemawalker.lazy import to_python_lazy, materialize
+    result = to_python_lazy(schema, data, wrappers)
+    materialized = materialize(result)
+    assert result == materialized
+    return materialized
+
+
+def _to_python_iterative(schema, data, wrappers=None):
+    from jsonschemawalker.iterative import to_python_iterative
+    return to_python_iterative(schema, data, wrappers)
+
+
+def _to_jsondict_iterative(schema, data, getter=getattr, verbose=False):
+    from jsonschemawalker.iterative import to_jsondict_iterative
+    return to_jsondict_iterative(schema, data, getter=getter, verbose=verbose)
+
+
+# module name -> {backend name: function replacing _callFUT}. "walker" keeps the module's own _callFUT
+backends = {
+    "test_to_python": {
+        "walker": None,
+        "many": _to_python_many,
+        "codegen": _to_python_codegen,
+        "decode-walk": _loads,
+        "fused": _loads_fused,
+        "lazy": _to_python_lazy,
+        "iterative": _to_python_iterative,
+    },
+    "test_to_jsondict": {
+        "walker": None,
+        "many": _to_jsondict_many,
+        "codegen": _to_jsondict_codegen,
+        "dumps": _dumps,
+        "iterative": _to_jsondict_iterative,
+    },
+}
+
+
+def _module_backends(module):
+    return backends.get(module.__name__.rsplit(".", 1)[-1])
+
+
+def pytest_generate_tests(metafunc):
+    candidates = _module_backends(metafunc.module)
+    if candidates is None or "backend" not in metafunc.fixturenames:
+        return
+    if "_callFUT" in metafunc.function.__code__.co_names:
+        metafunc.parametrize("backend", list(candidates), indirect=True)
+
+
+@pytest.fixture
+def backend(request, monkeypatch):
+    name = getattr(request, "param", "walker")
+    fn = _module_backends(request.module)[name]
+    if fn is not None:
+        monkeypatch.setattr(request.module, "_callFUT", fn)
+    return name
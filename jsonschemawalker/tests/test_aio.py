@@ -0,0 +1,102 @@
+# -*- coding:utf-8 -*-
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+schema = {
+    "type": "array",
+    "items": {"type": "object",
+              "properties": {"id": {"type": "integer"},
+                             "tags": {"type": "array", "items": {"type": "object",
+                                                                 "properties": {"name": {"type": "string"}}}}}}}
+
+
+def _data(n):
+    return [{"id": str(i), "tags": [{"name": "x"}, {"name": "y"}]} for i in range(n)]
+
+
+def _expected(n):
+    return [{"id": i, "tags": [{"name": "x"}, {"name": "y"}]} for i in range(n)]
+
+
+def _run_counting(coro):
+    # the number of times the event loop got control while `coro` was running
+    ticks = []
+
+    async def ticker(done):
+        while not done.is_set():
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def main():
+        done = asyncio.Event()
+        task = asyncio.ensure_future(ticker(done))
+        try:
+            return await coro
+        finally:
+            done.set()
+            await task
+
+    return asyncio.run(main()), len(ticks)
+
+
+def test_ato_python():
+    from jsonschemawalker.aio import ato_python
+    result, ticks = _run_counting(ato_python(schema, _data(100), every=10))
+    assert result == _expected(100)
+    assert ticks >= (1 + 100 * 2) // 10
+
+
+def test_ato_python__interval():
+    from jsonschemawalker.aio import ato_python
+    result, ticks = _run_counting(ato_python(schema, _data(100), every=1, interval=3600))
+    assert result == _expected(100)
+    assert ticks <= 2
+
+
+def test_ato_python__executor():
+    from jsonschemawalker.aio import ato_python
+    with ThreadPoolExecutor(1) as executor:
+        result, _ = _run_counting(ato_python(schema, _data(100), executor=executor, threshold=10))
+    assert result == _expected(100)
+
+
+def test_ato_jsondict():
+    from jsonschemawalker.aio import ato_jsondict
+    getter = lambda d, k, default: d.get(k, default)  # NOQA
+    result, ticks = _run_counting(ato_jsondict(schema, _expected(100), getter=getter, every=10))
+    assert result == _expected(100)
+    assert ticks >= 10
+
+
+@pytest.mark.parametrize("threshold", [None, 1])
+def test_aloads(threshold):
+    import json
+    from jsonschemawalker.aio import aloads
+    with ThreadPoolExecutor(1) as executor:
+        result, _ = _run_counting(aloads(schema, json.dumps(_data(3)), executor=executor, threshold=threshold))
+    assert result == _expected(3)
+
+
+def test_aiter_python():
+    from jsonschemawalker.aio import aiter_python
+
+    async def collect():
+        return [x async for x in aiter_python(schema, _data(100), every=10)]
+    result, ticks = _run_counting(collect())
+    assert result == _expected(100)
+    assert ticks >= 10
+
+
+def test_aiter_python__async_iterable():
+    from jsonschemawalker.aio import aiter_python
+
+    async def source():
+        for v in _data(3):
+            await asyncio.sleep(0)
+            yield v
+
+    async def collect():
+        return [x async for x in aiter_python(schema, source())]
+    result, _ = _run_counting(collect())
+    assert result == _expected(3)
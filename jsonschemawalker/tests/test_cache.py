@@ -0,0 +1,110 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+
+@pytest.fixture
+def walker_cache():
+    from jsonschemawalker import walker_cache
+    walker_cache.clear()
+    yield walker_cache
+    walker_cache.resize(128)
+    walker_cache.clear()
+
+
+def _makeOne(*args, **kwargs):
+    from jsonschemawalker.cache import LRUCache
+    return LRUCache(*args, **kwargs)
+
+
+def test_lru__eviction():
+    cache = _makeOne(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+    assert "b" not in cache
+    assert sorted(cache.data.keys()) == ["a", "c"]
+    assert cache.info() == (1, 0, 2, 2)
+
+
+def test_lru__miss():
+    cache = _makeOne(2)
+    assert cache.get("x") is None
+    with pytest.raises(KeyError):
+        cache["x"]
+    assert cache.info().misses == 2
+
+
+def test_to_python__cached(walker_cache):
+    from jsonschemawalker import to_python
+    schema = {"type": "object", "properties": {"age": {"type": "integer"}}}
+    assert to_python(schema, {"age": "1"}) == {"age": 1}
+    assert to_python(schema, {"age": "2"}) == {"age": 2}
+    assert walker_cache.info().hits == 1
+    assert walker_cache.info().currsize == 1
+
+
+def test_to_python__wrappers_are_part_of_key(walker_cache):
+    from collections import namedtuple
+    from jsonschemawalker import to_python
+    User = namedtuple("User", "age")
+    schema = {"title": "User", "properties": {"age": {"type": "integer"}}}
+    assert to_python(schema, {"age": "1"}) == {"age": 1}
+    assert to_python(schema, {"age": "1"}, {"User": User}) == User(age=1)
+    assert to_python(schema, {"age": "1"}, {"User": User}) == User(age=1)
+    assert walker_cache.info() == (1, 2, 128, 2)
+
+
+def test_to_jsondict__cached(walker_cache):
+    from jsonschemawalker import to_jsondict
+    schema = {"type": "object", "properties": {"age": {"type": "integer"}}}
+    assert to_jsondict(schema, {"age": "1"}, getter=dict.get) == {"age": 1}
+    assert to_jsondict(schema, {"age": "1"}, getter=dict.get, verbose=True) == {"age": 1}
+    assert to_jsondict(schema, {"age": "1"}, getter=dict.get) == {"age": 1}
+    assert walker_cache.info().hits == 1
+
+
+def test_by_content():
+    from jsonschemawalker import WalkerCache, ToPythonWalker
+    cache = WalkerCache(by_content=True)
+    created = []
+
+    def create():
+        created.append(1)
+        return ToPythonWalker({"type": "integer"})
+    cache.get({"type": "integer"}, None, create)
+    cache.get({"type": "integer"}, None, create)
+    assert len(created) == 1
+
+
+def test_plan(walker_cache):
+    from jsonschemawalker import compile, to_python
+    plan = compile({"type": "object", "properties": {"age": {"type": "integer"}}})
+    for _ in range(3):
+        assert to_python(plan, {"age": "1"}) == {"age": 1}
+    info = walker_cache.info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+
+def test_reused_id(walker_cache):
+    from jsonschemawalker import WalkerCache, ToPythonWalker
+    cache = WalkerCache()
+    created = []
+
+    def create():
+        created.append(1)
+        return ToPythonWalker({"type": "integer"})
+    schema = {"type": "integer"}
+    cache.get(schema, None, create)
+    cache.cache[(id(schema), None)] = ({"type": "integer"}, None)  # as if the id was reused
+    cache.get(schema, None, create)
+    assert len(created) == 2
+    assert (cache.info().hits, cache.info().misses) == (0, 2)
+
+
+def test_resize(walker_cache):
+    from jsonschemawalker import to_python
+    walker_cache.resize(1)
+    to_python({"type": "integer"}, "1")
+    to_python({"type": "number"}, "1")
+    assert walker_cache.info().currsize == 1
@@ -0,0 +1,27 @@
+# -*- coding:utf-8 -*-
+
+
+def test_flat_source():
+    from jsonschemawalker.codegen import to_python_function
+    schema = {
+        "title": "User",
+        "properties": {
+            "name": {"type": "string"},
+            "age": {"type": "integer"},
+        }
+    }
+    fn = to_python_function(schema)
+    assert "walk" not in fn.source
+    assert "x0 = v.get('name')" in fn.source
+    assert fn({"name": "foo", "age": "20"}) == {"name": "foo", "age": 20}
+
+
+def test_recursive():
+    from jsonschemawalker.codegen import to_python_function
+    schema = {"definitions": {
+        "Tree": {"properties": {"value": {"type": "integer"},
+                                "children": {"type": "array", "items": {"$ref": "#/definitions/Tree"}}}}
+    }, "$ref": "#/definitions/Tree"}
+    fn = to_python_function(schema)
+    result = fn({"value": "1", "children": [{"value": "2", "children": []}]})
+    assert result == {"value": 1, "children": [{"value": 2, "children": []}]}
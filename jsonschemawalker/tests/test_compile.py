@@ -0,0 +1,237 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+
+def _callFUT(*args, **kwargs):
+    from jsonschemawalker import compile
+    return compile(*args, **kwargs)
+
+
+def test_atom():
+    from jsonschemawalker import AtomNode
+    plan = _callFUT({"type": "integer", "default": 0})
+    assert isinstance(plan.root, AtomNode)
+    assert plan.root.convert is int
+    assert plan.root.default == 0
+
+
+def test_object__properties():
+    schema = {"type": "object",
+              "properties": {"name": {"type": "string"}, "age": {"type": "integer"}}}
+    plan = _callFUT(schema)
+    assert [k for k, _ in plan.root.properties] == ["name", "age"]
+    assert [node.path for _, node in plan.root.properties] == ["#/properties/name", "#/properties/age"]
+
+
+def test_object__order():
+    schema = {"type": "object",
+              "properties": {"$order": ["age", "name"], "name": {"type": "string"}, "age": {"type": "integer"}}}
+    plan = _callFUT(schema)
+    assert [k for k, _ in plan.root.properties] == ["age", "name"]
+
+
+def test_reference__resolved_once():
+    schema = {"type": "object",
+              "definitions": {
+                  "User": {"properties": {"name": {"type": "string"}}}
+              },
+              "properties": {"owner": {"$ref": "#/definitions/User"},
+                             "members": {"type": "array", "items": {"$ref": "#/definitions/User"}}}}
+    plan = _callFUT(schema)
+    owner = plan.root.properties[0][1]
+    members = plan.root.properties[1][1]
+    assert owner.target is members.items.target
+    assert list(plan.references.keys()) == ["#/definitions/User"]
+
+
+def test_reference__recursive():
+    from jsonschemawalker import ToPythonWalker
+    schema = {"type": "object",
+              "definitions": {
+                  "Tree": {"properties": {"value": {"type": "integer"},
+                                          "children": {"type": "array", "items": {"$ref": "#/definitions/Tree"}}}}
+              },
+              "properties": {"root": {"$ref": "#/definitions/Tree"}}}
+    plan = _callFUT(schema)
+    value = {"root": {"value": "1", "children": [{"value": "2", "children": []}]}}
+    result = ToPythonWalker(plan)(value)
+    assert result == {"root": {"value": 1, "children": [{"value": 2, "children": []}]}}
+
+
+@pytest.mark.parametrize("value, expected", [
+    ({"x": "10", "y": "20"}, {"x": 10, "y": 20}),
+    ({"x": "10", "y": "20", "z": "30"}, {"x": 10, "y": 20, "z": 30}),
+])
+def test_plan__reused(value, expected):
+    from jsonschemawalker import ToPythonWalker
+    schema = {"type": "object",
+              "definitions": {
+                  "Point2": {"properties": {"x": {"type": "integer"}, "y": {"type": "integer"}}},
+                  "Point3": {"properties": {"x": {"type": "integer"}, "y": {"type": "integer"}, "z": {"type": "integer"}}}
+              },
+              "anyOf": [{"$ref": "#/definitions/Point2"}, {"$ref": "#/definitions/Point3"}]
+              }
+    walker = ToPythonWalker(_callFUT(schema))
+    assert walker(value) == expected
+    assert walker(value) == expected
+
+
+def _pattern_node(patterns, additional=True):
+    schema = {"type": "object", "patternProperties": patterns, "additionalProperties": additional}
+    return _callFUT(schema).root
+
+
+def test_pattern_properties__combined():
+    from collections import OrderedDict
+    patterns = OrderedDict([("b$", {"type": "integer"}), ("^a", {"type": "string"}), ("^c", {})])
+    node = _pattern_node(patterns)
+    assert node.combined is not None
+    assert node.match("ab") is node.patterns[0][1]
+    assert node.match("ax") is node.patterns[1][1]
+    assert node.match("cc") is node.patterns[2][1]
+    assert node.match("zz") is node.additional
+
+
+def test_pattern_properties__decisions():
+    node = _pattern_node({"^answer_[0-9]+$": {"type": "integer"}, "^question_[0-9]+$": {}}, additional=False)
+    assert node.match("comment") is None
+    assert node.match("answer_1") is node.patterns[0][1]
+    assert node.decisions == {"comment": None, "answer_1": node.patterns[0][1]}
+
+
+def test_pattern_properties__backreference():
+    node = _pattern_node({"^(a)\\1$": {"type": "integer"}, "^b": {}}, additional=False)
+    assert node.combined is None
+    assert node.match("aa") is node.patterns[0][1]
+    assert node.match("ab") is None
+
+
+def test_one_of__candidates():
+    schema = {"type": "object",
+              "definitions": {
+                  "Success": {"properties": {"value": {}}},
+                  "Failure": {"properties": {"name": {"type": "string"}, "message": {"type": "string"}}}
+              },
+              "oneOf": [{"$ref": "#/definitions/Success"}, {"$ref": "#/definitions/Failure"}]
+              }
+    node = _callFUT(schema).root
+    assert [names for names, _ in node.candidates] == [frozenset(["value"]), frozenset(["name", "message"])]
+    assert node.discriminator is None
+    failure = node.candidates[1][1]
+    assert node.select({"name": "x", "message": "y"}) is failure
+    assert node.decisions == {("name", "message"): failure}
+
+
+def test_all_of__merged():
+    from jsonschemawalker import Control
+    schema = {"definitions": {
+        "A": {"properties": {"a": {"type": "string"}}, "required": ["a"]},
+        "B": {"allOf": [{"$ref": "#/definitions/A"}, {"properties": {"b": {}}, "required": ["a", "b"]}]},
+    }, "allOf": [{"$ref": "#/definitions/B"}, {"properties": {"c": {}}}]}
+    control = Control(merged_cache_size=1)
+    merged = control.detect_merged(schema["allOf"], schema)
+    assert merged == {"type": "object", "properties": {"a": {"type": "string"}, "b": {}, "c": {}}, "required": ["a", "b"]}
+    assert control.detect_merged(schema["allOf"], schema) is merged
+    control.detect_merged(schema["definitions"]["B"]["allOf"], schema)
+    assert control.merged_cache.info().currsize == 1
+
+
+_projection_schema = {
+    "type": "object",
+    "definitions": {
+        "User": {"properties": {"name": {"type": "string"}, "age": {"type": "integer"},
+                                "friends": {"type": "array", "items": {"$ref": "#/definitions/User"}}}}
+    },
+    "properties": {"id": {"type": "integer"},
+                   "owner": {"$ref": "#/definitions/User"},
+                   "members": {"type": "array", "items": {"$ref": "#/definitions/User"}}}}
+
+
+@pytest.mark.parametrize("projection, exclude, expected", [
+    (None, None, ["id", "owner", "members"]),
+    (["/id", "/owner/name"], None, ["id", "owner"]),
+    ({"id": True, "members": {"name": True}}, None, ["id", "members"]),
+    (None, ["/owner"], ["id", "members"]),
+    (["/owner"], ["/owner/friends"], ["owner"]),
+])
+def test_projection__properties(projection, exclude, expected):
+    plan = _callFUT(_projection_schema, projection=projection, exclude=exclude)
+    assert [k for k, _ in plan.root.properties] == expected
+
+
+def test_projection__reference():
+    plan = _callFUT(_projection_schema, projection=["/owner/name", "/members/*/name", "/members/*/age"])
+    owner = dict(plan.root.properties)["owner"].target
+    member = dict(plan.root.properties)["members"].items.target
+    assert [k for k, _ in owner.properties] == ["name"]
+    assert [k for k, _ in member.properties] == ["name", "age"]
+
+
+def test_projection__reference__shared():
+    plan = _callFUT(_projection_schema, projection=["/owner/name", "/members/name"])
+    owner = dict(plan.root.properties)["owner"].target
+    member = dict(plan.root.properties)["members"].items.target
+    assert owner is member
+
+
+def test_projection__recursive_reference():
+    plan = _callFUT(_projection_schema, exclude=["/owner/age"])
+    owner = dict(plan.root.properties)["owner"].target
+    assert [k for k, _ in owner.properties] == ["name", "friends"]
+    friend = dict(owner.properties)["friends"].items.target
+    assert [k for k, _ in friend.properties] == ["name", "age", "friends"]
+
+
+def test_projection__pattern_properties():
+    schema = {"type": "object",
+              "patternProperties": {"^x-": {"type": "integer"}},
+              "properties": {"id": {"type": "integer"}}}
+    plan = _callFUT(schema, projection=["/x-a"])
+    assert plan.root.match("x-a").convert is int
+    assert plan.root.match("x-b") is None
+    assert plan.root.match("id") is None
+
+
+@pytest.mark.parametrize("spec, expected", [
+    (None, None),
+    (["/a", "/b/c"], {"a": True, "b": {"c": True}}),
+    (["/a", "/a/b"], {"a": True}),
+    (["/a/b", "/a"], {"a": True}),
+    (["#/a~1b/c~0d"], {"a/b": {"c~d": True}}),
+    (["/items/*/name"], {"items": {"name": True}}),
+    ({"a": 1, "b": {"c": True}}, {"a": True, "b": {"c": True}}),
+])
+def test_normalize_mask(spec, expected):
+    from jsonschemawalker import normalize_mask
+    assert normalize_mask(spec) == expected
+
+
+def test_control__per_walker():
+    from jsonschemawalker import ToPythonWalker
+    x = ToPythonWalker({"type": "string"})
+    y = ToPythonWalker({"type": "string"})
+    assert x.control is not y.control
+
+
+def test_control__regexp_cache():
+    from jsonschemawalker import Control
+    control = Control(regexp_cache_size=1)
+    assert control.get_regexp("^a") is control.get_regexp("^a")
+    control.get_regexp("^b")
+    info = control.info()["regexp"]
+    assert (info.hits, info.maxsize, info.currsize) == (1, 1, 1)
+
+
+def test_plan__direction():
+    from datetime import datetime
+    from jsonschemawalker import ToPythonWalker, ToJSONDictWalker, Converter, default_python_to_json_mapping
+    schema = {"type": "object", "properties": {"at": {"type": "string", "format": "date-time"}}}
+    plan = _callFUT(schema)  # json -> python
+    assert ToPythonWalker(plan)({"at": "2000-01-01T00:00:00"}) == {"at": datetime(2000, 1, 1)}
+    with pytest.raises(ValueError):
+        ToJSONDictWalker(plan, getattr)
+
+    converter = Converter(default_python_to_json_mapping)
+    plan = _callFUT(schema, converter=converter)
+    result = ToJSONDictWalker(plan, lambda o, k, d: o.get(k, d), converter=converter)({"at": datetime(2000, 1, 1)})
+    assert result == {"at": "2000-01-01T00:00:00+00:00"}
@@ -0,0 +1,46 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+
+def _callFUT(*args, **kwargs):
+    from jsonschemawalker.decoding import loads
+    return loads(*args, **kwargs)
+
+
+def test_bytes_and_skipped_properties():
+    schema = {"properties": {"name": {"type": "string"}, "age": {"type": "integer"}}}
+    text = '{"xxx": {"deep": [1, 2, {"a": null}]}, "name": "ユーザー", "age": "20"}'.encode("utf-8")
+    assert _callFUT(schema, text, fused=True) == {"name": "ユーザー", "age": 20}
+
+
+def test_nested_arrays():
+    schema = {"type": "array", "items": {"type": "array", "items": {"type": "number"}}}
+    assert _callFUT(schema, "[[1, 2], [], [3.5]]", fused=True) == [[1.0, 2.0], [], [3.5]]
+
+
+def test_null_object():
+    schema = {"properties": {"group": {"properties": {"name": {"type": "string"}}}}}
+    assert _callFUT(schema, '{"group": null}', fused=True) == {"group": None}
+
+
+@pytest.mark.parametrize("text", ['{"name": "x",}', '{"name" "x"}', '[1, 2', '{"name": "x"} x', '{name: 1}', '{"name": '])
+@pytest.mark.parametrize("fused", [False, True])
+def test_broken(text, fused):
+    with pytest.raises(ValueError):
+        _callFUT({"properties": {"name": {}}}, text, fused=fused)
+
+
+@pytest.mark.parametrize("fused", [False, True])
+def test_big_integer(fused):
+    schema = {"properties": {"n": {"type": "integer"}}}
+    assert _callFUT(schema, '{"n": 123456789012345678901234567890}', fused=fused) == {"n": 123456789012345678901234567890}
+
+
+def test_decoder():
+    calls = []
+
+    def decoder(s):
+        calls.append(s)
+        return {"n": "1"}
+    assert _callFUT({"properties": {"n": {"type": "integer"}}}, "{}", decoder=decoder) == {"n": 1}
+    assert calls == ["{}"]
@@ -0,0 +1,35 @@
+# -*- coding:utf-8 -*-
+import io
+import json
+
+
+schema = {"type": "object",
+          "definitions": {
+              "User": {"properties": {"name": {"type": "string"}, "score": {"type": "number"}, "extra": {}}}
+          },
+          "properties": {"users": {"type": "array", "items": {"$ref": "#/definitions/User"}}}}
+
+
+def test_dump__chunked():
+    from jsonschemawalker.encoding import Encoder
+    from jsonschemawalker import ToJSONDictWalker
+
+    class Writer(io.StringIO):
+        writes = 0
+
+        def write(self, s):
+            self.writes += 1
+            return super(Writer, self).write(s)
+
+    users = [{"name": "ユーザー{}".format(i), "score": i, "extra": {"a": [1, None, True]}} for i in range(100)]
+    fp = Writer()
+    Encoder(ToJSONDictWalker(schema, dict.get), buffer_size=50).dump({"users": users}, fp)
+    assert fp.writes > 1
+    assert json.loads(fp.getvalue()) == {"users": [dict(u, score=float(u["score"])) for u in users]}
+
+
+def test_dumps__ensure_ascii():
+    from jsonschemawalker.encoding import dumps
+    value = {"users": [{"name": "ユーザー", "score": 1.5}]}
+    assert dumps(schema, value, getter=dict.get) == '{"users": [{"name": "\\u30e6\\u30fc\\u30b6\\u30fc", "score": 1.5}]}'
+    assert dumps(schema, value, getter=dict.get, ensure_ascii=False) == '{"users": [{"name": "ユーザー", "score": 1.5}]}'
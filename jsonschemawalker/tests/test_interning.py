@@ -0,0 +1,73 @@
+# -*- coding:utf-8 -*-
+
+schema = {
+    "type": "object",
+    "properties": {
+        "status": {"type": "string", "enum": ["active", "inactive"]},
+        "country": {"type": "string", "x-intern": True},
+        "name": {"type": "string"},
+        "created_at": {"type": "string", "format": "date-time", "x-intern": True},
+        "code": {"type": "integer", "enum": [1, 2]},
+        "tags": {"type": "object", "patternProperties": {"^t": {"type": "string"}}},
+    }
+}
+
+
+def _makeOne(schema, intern=True):
+    from jsonschemawalker import ToPythonWalker, Converter, default_json_to_python_mapping
+    converter = Converter(default_json_to_python_mapping, intern=intern)
+    return ToPythonWalker(schema, converter=converter)
+
+
+def _records():
+    # equal, but distinct objects
+    return [{"status": "".join(["act", "ive"]), "country": "".join(["J", "P"]), "name": "".join(["fo", "o"]),
+             "created_at": "".join(["2000-01-01T00:00:00", "Z"]), "code": 1,
+             "tags": {"".join(["t", "1"]): "x"}}
+            for _ in range(2)]
+
+
+def test_interned():
+    walker = _makeOne(schema)
+    x, y = [walker(v) for v in _records()]
+    assert x == y
+    assert x["status"] is y["status"]
+    assert x["country"] is y["country"]
+    assert x["created_at"] is y["created_at"]
+    assert x["name"] is not y["name"]
+    assert list(x["tags"])[0] is list(y["tags"])[0]
+
+
+def test_not_interned():
+    walker = _makeOne(schema, intern=False)
+    x, y = [walker(v) for v in _records()]
+    assert x == y
+    assert x["status"] is not y["status"]
+    assert x["created_at"] is not y["created_at"]
+
+
+def test_opt_out():
+    walker = _makeOne({"type": "string", "enum": ["a", "b"], "x-intern": False})
+    assert walker("".join(["a", ""])) is not walker("".join(["a", ""]))
+
+
+def test_non_str_values():
+    walker = _makeOne({"type": "array", "items": {"type": "integer", "enum": [1, 2]}})
+    assert walker([1, 2, 1, "2"]) == [1, 2, 1, 2]
+
+
+def test_bounded():
+    from jsonschemawalker import Interner
+    interner = Interner(maxsize=2)
+    convert = interner.wrap(str.upper)
+    assert [convert(x) for x in ["a", "b", "c", "a"]] == ["A", "B", "C", "A"]
+    assert len(interner.tables[str.upper]) <= 2
+
+
+def test_codegen():
+    from jsonschemawalker import Converter, default_json_to_python_mapping
+    from jsonschemawalker.codegen import to_python_function
+    fn = to_python_function(schema, converter=Converter(default_json_to_python_mapping, intern=True))
+    x, y = [fn(v) for v in _records()]
+    assert x["status"] is y["status"]
+    assert list(x["tags"])[0] is list(y["tags"])[0]
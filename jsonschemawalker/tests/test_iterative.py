@@ -0,0 +1,94 @@
+# -*- coding:utf-8 -*-
+import sys
+import pytest
+
+
+thread_schema = {
+    "type": "object",
+    "definitions": {
+        "comment": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "replies": {"type": "array", "items": {"$ref": "#/definitions/comment"}},
+            }
+        }
+    },
+    "properties": {"root": {"$ref": "#/definitions/comment"}}}
+
+
+def _thread(depth):
+    root = current = {"id": "0", "replies": []}
+    for i in range(1, depth):
+        reply = {"id": str(i), "replies": []}
+        current["replies"].append(reply)
+        current = reply
+    return {"root": root}
+
+
+def _depth(d):
+    n = 0
+    d = d["root"]
+    while d["replies"]:
+        d = d["replies"][0]
+        n += 1
+    return n + 1
+
+
+def test_to_python__deep():
+    from jsonschemawalker.iterative import to_python_iterative
+    depth = sys.getrecursionlimit() * 2
+    result = to_python_iterative(thread_schema, _thread(depth))
+    assert _depth(result) == depth
+    assert result["root"]["replies"][0]["id"] == 1
+
+
+def test_to_python__deep__fallback():
+    from jsonschemawalker import ToPythonWalker
+    depth = sys.getrecursionlimit() * 2
+    result = ToPythonWalker(thread_schema, iterative_fallback=True)(_thread(depth))
+    assert _depth(result) == depth
+
+
+def test_to_jsondict__deep__fallback():
+    from jsonschemawalker import ToJSONDictWalker
+    depth = sys.getrecursionlimit() * 2
+    walker = ToJSONDictWalker(thread_schema, getter=lambda d, k, default: d.get(k, default), iterative_fallback=True)
+    result = walker(_thread(depth))
+    assert _depth(result) == depth
+
+
+def test_to_python__deep__no_fallback():
+    from jsonschemawalker import ToPythonWalker
+    depth = sys.getrecursionlimit() * 2
+    with pytest.raises(RecursionError):
+        ToPythonWalker(thread_schema)(_thread(depth))
+
+
+def test_to_python__wrappers():
+    from jsonschemawalker.iterative import IterativeToPythonWalker
+
+    class Comment(object):
+        def __init__(self, id, replies):
+            self.id, self.replies = id, replies
+
+    walker = IterativeToPythonWalker(thread_schema, wrappers={"comment": Comment})
+    result = walker(_thread(3))
+    assert result["root"].replies[0].replies[0].id == 2
+    assert result["root"].replies[0].replies[0].replies == []
+
+
+def test_steps():
+    from jsonschemawalker.iterative import IterativeToPythonWalker, run
+    walker = IterativeToPythonWalker(thread_schema)
+    steps = walker.steps(_thread(10), every=3)
+    paused = 0
+    try:
+        while True:
+            next(steps)
+            paused += 1
+    except StopIteration as e:
+        result = e.value
+    assert paused == (1 + 10 + 10) // 3  # the root, 10 comments and 10 arrays of replies
+    assert result == run(walker.steps(_thread(10)))
+    assert _depth(result) == 10
@@ -0,0 +1,36 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+
+def _makeOne(schema, calls):
+    from jsonschemawalker import Converter, default_json_to_python_mapping
+    from jsonschemawalker.lazy import LazyToPythonWalker
+
+    def as_int(v):
+        calls.append(v)
+        return int(v)
+    mapping = dict(default_json_to_python_mapping)
+    mapping[("integer", None)] = as_int
+    return LazyToPythonWalker(schema, converter=Converter(mapping))
+
+
+def test_convert_on_access():
+    schema = {"properties": {"a": {"type": "integer"}, "b": {"type": "integer"},
+                             "c": {"type": "array", "items": {"properties": {"d": {"type": "integer"}}}}}}
+    calls = []
+    result = _makeOne(schema, calls)({"a": "1", "b": "2", "c": [{"d": "3"}, {"d": "4"}]})
+    assert calls == []
+    assert result["a"] == 1
+    assert result["a"] == 1
+    assert calls == ["1"]
+    assert result["c"][1]["d"] == 4
+    assert calls == ["1", "4"]
+    assert list(result.keys()) == ["a", "b", "c"]
+    assert len(result["c"]) == 2
+
+
+def test_missing_key():
+    result = _makeOne({"properties": {"a": {"type": "integer"}}}, [])({"a": "1", "x": "2"})
+    with pytest.raises(KeyError):
+        result["x"]
+    assert result.get("x") is None
@@ -0,0 +1,40 @@
+# -*- coding:utf-8 -*-
+
+
+def test_to_python_many__columns():
+    from jsonschemawalker import to_python_many
+    schema = {"type": "object",
+              "properties": {"name": {"type": "string"},
+                             "age": {"type": "integer", "default": 0},
+                             "tags": {"type": "array", "items": {"type": "integer"}}}}
+    records = [{"name": "a", "age": "1", "tags": ["1", "2"]},
+               {"name": "b", "tags": None},
+               {"name": "c", "age": "3", "tags": []}]
+    assert to_python_many(schema, records) == [
+        {"name": "a", "age": 1, "tags": [1, 2]},
+        {"name": "b", "age": 0, "tags": None},
+        {"name": "c", "age": 3, "tags": []},
+    ]
+
+
+def test_to_python_many__one_of():
+    from jsonschemawalker import to_python_many
+    schema = {"type": "object",
+              "definitions": {
+                  "Success": {"properties": {"value": {"type": "integer"}}},
+                  "Failure": {"properties": {"name": {"type": "string"}, "message": {"type": "string"}}}
+              },
+              "oneOf": [{"$ref": "#/definitions/Success"}, {"$ref": "#/definitions/Failure"}]
+              }
+    records = [{"value": "1"}, {"name": "x", "message": "y"}, {"value": "2"}]
+    assert to_python_many(schema, records) == [{"value": 1}, {"name": "x", "message": "y"}, {"value": 2}]
+
+
+def test_to_jsondict_many__skip_missing():
+    from jsonschemawalker import to_jsondict_many
+    schema = {"type": "object",
+              "properties": {"name": {"type": "string"}, "age": {"type": "integer"}}}
+    objs = [{"name": "a", "age": "1"}, {"name": "b"}]
+    assert to_jsondict_many(schema, objs, getter=dict.get) == [{"name": "a", "age": 1}, {"name": "b"}]
+    assert to_jsondict_many(schema, objs, getter=dict.get, verbose=True) == [
+        {"name": "a", "age": 1}, {"name": "b", "age": None}]
@@ -0,0 +1,54 @@
+# -*- coding:utf-8 -*-
+import pytest
+from collections import namedtuple
+
+User = namedtuple("User", "name age")
+
+schema = {"type": "object",
+          "definitions": {
+              "User": {"properties": {"name": {"type": "string"}, "age": {"type": "integer"}}}
+          },
+          "$ref": "#/definitions/User"}
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_to_python_parallel(ordered):
+    from jsonschemawalker.parallel import to_python_parallel
+    values = ({"name": "u{}".format(i), "age": str(i)} for i in range(100))
+    result = list(to_python_parallel(schema, values, workers=2, chunksize=7, ordered=ordered, wrappers={"User": User}))
+    expected = [User(name="u{}".format(i), age=i) for i in range(100)]
+    if ordered:
+        assert result == expected
+    else:
+        assert sorted(result, key=lambda u: u.age) == expected
+
+
+def test_to_jsondict_parallel():
+    from jsonschemawalker.parallel import to_jsondict_parallel
+    values = [User(name="u{}".format(i), age=str(i)) for i in range(10)]
+    result = list(to_jsondict_parallel(schema, values, workers=2, chunksize=3))
+    assert result == [{"name": "u{}".format(i), "age": i} for i in range(10)]
+
+
+def test_chunked():
+    from jsonschemawalker.parallel import chunked
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_to_python_threaded(ordered):
+    from jsonschemawalker.parallel import to_python_threaded
+    values = ({"name": "u{}".format(i), "age": str(i)} for i in range(100))
+    result = list(to_python_threaded(schema, values, workers=4, chunksize=7, ordered=ordered, wrappers={"User": User}))
+    expected = [User(name="u{}".format(i), age=i) for i in range(100)]
+    if ordered:
+        assert result == expected
+    else:
+        assert sorted(result, key=lambda u: u.age) == expected
+
+
+def test_to_jsondict_threaded():
+    from jsonschemawalker.parallel import to_jsondict_threaded
+    values = [User(name="u{}".format(i), age=str(i)) for i in range(10)]
+    result = list(to_jsondict_threaded(schema, values, workers=2, chunksize=3))
+    assert result == [{"name": "u{}".format(i), "age": i} for i in range(10)]
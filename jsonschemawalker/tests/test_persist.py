@@ -0,0 +1,156 @@
+# -*- coding:utf-8 -*-
+import json
+import os
+
+schema = {
+    "type": "object",
+    "definitions": {
+        "User": {"properties": {"name": {"type": "string"}, "created_at": {"type": "string", "format": "date-time"}}},
+        "Base": {"properties": {"id": {"type": "integer"}}},
+    },
+    "properties": {
+        "owner": {"$ref": "#/definitions/User"},
+        "members": {"type": "array", "items": {"$ref": "#/definitions/User"}},
+        "item": {"allOf": [{"$ref": "#/definitions/Base"}, {"properties": {"label": {"type": "string"}}}]},
+        "tags": {"type": "object", "patternProperties": {"^t": {"type": "integer"}, "^u": {"type": "string"}}},
+    }}
+
+data = {"owner": {"name": "foo", "created_at": "2000-01-01T00:00:00Z"}, "members": [{"name": "bar"}],
+        "item": {"id": "1", "label": "x"}, "tags": {"t1": "1", "u1": "u"}}
+
+
+def _callFUT(*args, **kwargs):
+    from jsonschemawalker.persist import cached_compile
+    return cached_compile(*args, **kwargs)
+
+
+def test_cached_compile(tmpdir):
+    from jsonschemawalker import ToPythonWalker, to_python
+    directory = str(tmpdir.join("plans"))
+    plan = _callFUT(schema, directory)
+    assert len(os.listdir(directory)) == 1
+    loaded = _callFUT(schema, directory)
+    assert loaded is not plan
+    assert ToPythonWalker(loaded)(data) == to_python(schema, data)
+
+
+def test_cached_compile__keyed_by_content(tmpdir):
+    directory = str(tmpdir)
+    _callFUT(schema, directory)
+    _callFUT(json.loads(json.dumps(schema)), directory)
+    assert len(os.listdir(directory)) == 1
+    _callFUT({"type": "string"}, directory)
+    assert len(os.listdir(directory)) == 2
+
+
+def test_cached_compile__keyed_by_converter(tmpdir):
+    from jsonschemawalker import Converter, default_json_to_python_mapping, as_datetime_cached
+    directory = str(tmpdir)
+    _callFUT(schema, directory)
+    mapping = dict(default_json_to_python_mapping)
+    mapping[("string", "date-time")] = as_datetime_cached
+    plan = _callFUT(schema, directory, converter=Converter(mapping))
+    assert len(os.listdir(directory)) == 2
+    assert plan.references["#/definitions/User"].properties[1][1].convert is as_datetime_cached
+
+
+def test_cached_compile__version(tmpdir, monkeypatch):
+    from jsonschemawalker import persist
+    directory = str(tmpdir)
+    plan = _callFUT(schema, directory)
+    cache = persist.PlanCache(directory)
+    [name] = os.listdir(directory)
+    key = name[:-len(".plan")]
+    assert cache.load(key) is not None
+    monkeypatch.setattr(persist, "__version__", "0.0.0")
+    assert cache.load(key) is None
+    assert plan is not None
+
+
+def test_cached_compile_file(tmpdir):
+    from jsonschemawalker import ToPythonWalker
+    from jsonschemawalker.persist import cached_compile_file
+    main = tmpdir.join("main.json")
+    definitions = tmpdir.join("definitions.json")
+    definitions.write(json.dumps({"User": {"properties": {"age": {"type": "integer"}}}}))
+    main.write(json.dumps({"type": "object", "properties": {"user": {"$ref": "definitions.json#/User"}}}))
+    directory = str(tmpdir.join("plans"))
+
+    loaded = []
+
+    def loader(uri):
+        loaded.append(uri)
+        with open(uri) as rf:
+            return json.load(rf)
+
+    plan = cached_compile_file(str(main), directory, loader=loader)
+    assert ToPythonWalker(plan)({"user": {"age": "20"}}) == {"user": {"age": 20}}
+    assert len(loaded) == 2
+
+    del loaded[:]
+    plan = cached_compile_file(str(main), directory, loader=loader)
+    assert loaded == []  # a fresh plan is loaded without reading the schema files
+    assert ToPythonWalker(plan)({"user": {"age": "20"}}) == {"user": {"age": 20}}
+
+    # a changed external file makes the cache stale
+    definitions.write(json.dumps({"User": {"properties": {"age": {"type": "string"}}}}))
+    st = os.stat(str(definitions))
+    os.utime(str(definitions), ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    plan = cached_compile_file(str(main), directory, loader=loader)
+    assert len(loaded) == 2
+    assert ToPythonWalker(plan)({"user": {"age": "20"}}) == {"user": {"age": "20"}}
+
+
+def test_broken_cache_file(tmpdir):
+    directory = str(tmpdir)
+    _callFUT(schema, directory)
+    [name] = os.listdir(directory)
+    tmpdir.join(name).write("broken")
+    assert _callFUT(schema, directory) is not None
+
+
+def test_pickled_converters():
+    import pickle
+    from jsonschemawalker import as_datetime, as_datetime_cached
+    assert pickle.loads(pickle.dumps(as_datetime_cached)) is as_datetime_cached
+    assert pickle.loads(pickle.dumps(as_datetime)) is as_datetime
+
+
+def test_cached_compile__long_reference_chain(tmpdir):
+    import sys
+    from jsonschemawalker import ToPythonWalker
+    size = sys.getrecursionlimit()
+    definitions = {"D{}".format(i): {"type": "object",
+                                     "properties": {"id": {"type": "integer"},
+                                                    "next": {"$ref": "#/definitions/D{}".format(i + 1)}}}
+                   for i in range(size)}
+    definitions["D{}".format(size)] = {"type": "object", "properties": {"id": {"type": "integer"}}}
+    chain = {"definitions": definitions, "$ref": "#/definitions/D0"}
+    _callFUT(chain, str(tmpdir))
+    plan = _callFUT(chain, str(tmpdir))
+    assert ToPythonWalker(plan)({"id": "0", "next": {"id": "1"}}) == {"id": 0, "next": {"id": 1, "next": None}}
+
+
+def test_cached_compile__unpicklable(tmpdir):
+    from jsonschemawalker import ToPythonWalker, Converter, default_json_to_python_mapping, to_python
+    directory = str(tmpdir)
+    mapping = dict(default_json_to_python_mapping)
+    mapping[("integer", None)] = lambda v: int(v)
+    plan = _callFUT(schema, directory, converter=Converter(mapping))
+    assert ToPythonWalker(plan, converter=Converter(mapping))(data) == to_python(schema, data)
+
+    converter = Converter(default_json_to_python_mapping, intern=True)
+    enum_schema = {"properties": {"kind": {"type": "string", "enum": ["a", "b"]}}}
+    plan = _callFUT(enum_schema, directory, converter=converter)
+    assert ToPythonWalker(plan, converter=converter)({"kind": "a"}) == {"kind": "a"}
+    assert os.listdir(directory) == []  # neither saved, nor left as temporary files
+
+
+def test_cached_compile__keyed_by_interning(tmpdir):
+    from jsonschemawalker import Converter, default_json_to_python_mapping
+    directory = str(tmpdir)
+    schema = {"properties": {"kind": {"type": "string", "enum": ["a", "b"]}}}
+    _callFUT(schema, directory)
+    plan = _callFUT(schema, directory, converter=Converter(default_json_to_python_mapping, intern=True))
+    [(_, node)] = plan.root.properties
+    assert hasattr(node.convert, "convert")  # interned
@@ -0,0 +1,91 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+schema = {
+    "type": "object",
+    "definitions": {
+        "Cat": {"properties": {"name": {"type": "string"}, "lives": {"type": "integer"}}},
+        "Dog": {"properties": {"name": {"type": "string"}, "bark": {"type": "string"}}},
+    },
+    "properties": {
+        "created_at": {"type": "string", "format": "date-time"},
+        "pets": {"type": "array", "items": {"oneOf": [{"$ref": "#/definitions/Cat"}, {"$ref": "#/definitions/Dog"}]}},
+        "extra": {"type": "object", "patternProperties": {"^x-": {"type": "integer"}}},
+    }
+}
+
+data = {"created_at": "2000-01-01T00:00:00Z",
+        "pets": [{"name": "tama", "lives": "9"}, {"name": "pochi", "bark": "bow"}, {"name": "mike", "lives": "9"}],
+        "extra": {"x-a": "1", "x-b": "2"}}
+
+
+def _makeOne(*args, **kwargs):
+    from jsonschemawalker.profiling import ProfilingToPythonWalker
+    return ProfilingToPythonWalker(*args, **kwargs)
+
+
+def test_paths():
+    from jsonschemawalker import to_python
+    walker = _makeOne(schema)
+    assert walker(data) == to_python(schema, data)
+    paths = dict(walker.profile.stats(walker.profile.paths))
+    assert paths["#"].count == 1
+    assert paths["#/properties/pets/items"].count == 3
+    assert paths["#/definitions/Cat/properties/lives"].count == 2
+    assert paths["#"].time >= paths["#/properties/pets"].time
+
+
+def test_converters():
+    walker = _makeOne(schema)
+    walker(data)
+    converters = dict(walker.profile.stats(walker.profile.converters))
+    assert converters["as_datetime"].count == 1
+    assert converters["int"].count == 4
+
+
+def test_hits():
+    walker = _makeOne(schema)
+    walker(data)
+    walker(data)
+    assert walker.profile.hits["branch"] == [4, 2]
+    assert walker.profile.hits["pattern"] == [2, 2]
+    assert walker.profile.hit_rates()["branch"] == pytest.approx(4 / 6.0)
+
+
+def test_callback():
+    calls = []
+    walker = _makeOne(schema, callback=lambda path, elapsed: calls.append(path))
+    walker(data)
+    assert calls[-1] == "#"
+    assert calls.count("#/properties/pets/items") == 3
+
+
+def test_many():
+    walker = _makeOne(schema)
+    walker.many([data, data])
+    paths = dict(walker.profile.stats(walker.profile.paths))
+    assert paths["#"].count == 2
+    assert paths["#/properties/created_at"].count == 2
+
+
+def test_report():
+    walker = _makeOne(schema)
+    walker(data)
+    report = walker.profile.report(limit=3)
+    assert "#/properties/pets" in report
+    assert "as_datetime" in report
+    assert "branch" in report
+    assert sorted(walker.caches().keys()) == ["merged", "references", "regexp", "walkers"]
+
+
+def test_to_jsondict():
+    from jsonschemawalker.profiling import ProfilingToJSONDictWalker
+
+    class Cat(object):
+        def __init__(self, name, lives):
+            self.name, self.lives = name, lives
+
+    walker = ProfilingToJSONDictWalker(schema["definitions"]["Cat"], getattr)
+    assert walker(Cat("tama", 9)) == {"name": "tama", "lives": 9}
+    paths = dict(walker.profile.stats(walker.profile.paths))
+    assert paths["#/properties/lives"].count == 1
@@ -0,0 +1,91 @@
+# -*- coding:utf-8 -*-
+import pytest
+from datetime import datetime
+
+schema = {
+    "type": "object",
+    "definitions": {
+        "User": {"properties": {"name": {"type": "string"},
+                                "birth": {"type": "string", "format": "date-time"}}}
+    },
+    "properties": {"id": {"type": "integer"},
+                   "owner": {"$ref": "#/definitions/User"},
+                   "members": {"type": "array", "items": {"$ref": "#/definitions/User"}}}}
+
+
+@pytest.mark.parametrize("projection, exclude, expected", [
+    (["/id"], None, {"id": 1}),
+    (["/owner/name"], None, {"owner": {"name": "foo"}}),
+    (["/members/*/name"], None, {"members": [{"name": "bar"}, {"name": "boo"}]}),
+    (None, ["/members", "/owner/birth"], {"id": 1, "owner": {"name": "foo"}}),
+])
+def test_to_python(projection, exclude, expected):
+    from jsonschemawalker import to_python
+    data = {"id": 1,
+            "owner": {"name": "foo", "birth": "2000-01-01T00:00:00Z"},
+            "members": [{"name": "bar", "birth": "broken"}, {"name": "boo", "birth": "broken"}]}
+    assert to_python(schema, data, projection=projection, exclude=exclude) == expected
+
+
+def test_to_python__cached_per_projection():
+    from jsonschemawalker import to_python
+    data = {"id": 1, "owner": {"name": "foo", "birth": "2000-01-01T00:00:00Z"}, "members": []}
+    assert to_python(schema, data, projection=["/id"]) == {"id": 1}
+    assert to_python(schema, data, projection=["/owner/birth"])["owner"]["birth"].year == 2000
+    assert len(to_python(schema, data)) == 3
+
+
+def test_to_jsondict():
+    from jsonschemawalker import to_jsondict
+
+    class User(object):
+        def __init__(self, name, birth):
+            self.name, self.birth = name, birth
+
+    class Group(object):
+        def __init__(self, id, owner, members):
+            self.id, self.owner, self.members = id, owner, members
+
+    group = Group(1, User("foo", datetime(2000, 1, 1)), [User("bar", None)])
+    assert to_jsondict(schema, group, projection={"owner": {"name": True}}) == {"owner": {"name": "foo"}}
+    assert to_jsondict(schema, group, exclude=["/owner", "/members/birth"]) == {"id": 1, "members": [{"name": "bar"}]}
+
+
+def _wrapped(plan, data, wrappers, backend):
+    import json
+    from jsonschemawalker import ToPythonWalker
+    from jsonschemawalker.codegen import to_python_function
+    from jsonschemawalker.decoding import Decoder
+    from jsonschemawalker.iterative import IterativeToPythonWalker
+    from jsonschemawalker.validation import ValidatingToPythonWalker
+    if backend == "walker":
+        return ToPythonWalker(plan, wrappers)(data)
+    elif backend == "many":
+        return ToPythonWalker(plan, wrappers).many([data])[0]
+    elif backend == "iterative":
+        return IterativeToPythonWalker(plan, wrappers)(data)
+    elif backend == "codegen":
+        return to_python_function(plan, wrappers)(data)
+    elif backend == "fused":
+        return Decoder(ToPythonWalker(plan, wrappers))(json.dumps(data))
+    return ValidatingToPythonWalker(plan, wrappers)(data)
+
+
+@pytest.mark.parametrize("backend", ["walker", "many", "iterative", "codegen", "fused", "validating"])
+def test_to_python__wrappers(backend):
+    # the wrapper gets None for the properties dropped by the projection
+    from collections import namedtuple
+    from jsonschemawalker import compile
+    User = namedtuple("User", "name birth")
+    data = {"id": 1, "owner": {"name": "foo", "birth": "2000-01-01T00:00:00Z"}, "members": [{"name": "bar"}]}
+    plan = compile(schema, projection=["/owner/name", "/members/*/name"])
+    result = _wrapped(plan, data, {"User": User}, backend)
+    assert result == {"owner": User(name="foo", birth=None), "members": [User(name="bar", birth=None)]}
+
+
+def test_to_python__wrappers__to_python():
+    from collections import namedtuple
+    from jsonschemawalker import to_python
+    U = namedtuple("U", "name age")
+    schema = {"title": "U", "properties": {"name": {"type": "string"}, "age": {"type": "integer"}}}
+    assert to_python(schema, {"name": "foo", "age": "1"}, {"U": U}, projection={"/name"}) == U(name="foo", age=None)
@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+schema = {
+    "title": "Group",
+    "type": "object",
+    "definitions": {
+        "User": {"type": "object",
+                 "properties": {"$order": ["name", "age"], "age": {"type": "integer"}, "name": {"type": "string"}}},
+        "Meta": {"type": "object", "properties": {"x-id": {"type": "string"}}},
+    },
+    "properties": {"name": {"type": "string"},
+                   "owner": {"$ref": "#/definitions/User"},
+                   "members": {"type": "array", "items": {"$ref": "#/definitions/User"}},
+                   "meta": {"$ref": "#/definitions/Meta"}}}
+
+
+def _callFUT(*args, **kwargs):
+    from jsonschemawalker.records import record_classes
+    return record_classes(*args, **kwargs)
+
+
+def test_record_classes():
+    classes = _callFUT(schema)
+    assert sorted(classes.keys()) == ["Group", "User"]
+    assert classes["User"]._fields == ("name", "age")
+    assert classes["Group"]._fields == ("name", "owner", "members", "meta")
+
+
+def test_record_class():
+    from jsonschemawalker.records import record_class
+    User = record_class("User", ["name", "age"])
+    user = User("foo", 20)
+    assert user == User(name="foo", age=20)
+    assert user != User("foo", 21)
+    assert repr(user) == "User(name='foo', age=20)"
+    assert user._asdict() == {"name": "foo", "age": 20}
+    assert list(user) == ["foo", 20]
+    assert not hasattr(user, "__dict__")
+
+
+def test_record_classes__self():
+    links = {"title": "Links", "properties": {"self": {"type": "string"}, "next": {"type": "string"}}}
+    Links = _callFUT(links)["Links"]
+    assert Links("/items/1", None).self == "/items/1"
+    assert Links(self="/items/1", next="/items/2").next == "/items/2"
+
+
+@pytest.mark.parametrize("fields", [["x-id"], ["class"], ["_private"]])
+def test_record_class__invalid_field(fields):
+    from jsonschemawalker.records import record_class
+    with pytest.raises(ValueError):
+        record_class("Invalid", fields)
+
+
+def test_to_python():
+    from jsonschemawalker import to_python
+    classes = _callFUT(schema)
+    Group, User = classes["Group"], classes["User"]
+    data = {"name": "g", "owner": {"name": "foo", "age": "20"},
+            "members": [{"age": "10", "name": "bar"}], "meta": {"x-id": "1"}}
+    result = to_python(schema, data, classes)
+    assert result == Group(name="g", owner=User("foo", 20), members=[User("bar", 10)], meta={"x-id": "1"})
+
+
+def test_to_python__positional():
+    from jsonschemawalker import ToPythonWalker
+
+    class User(object):
+        _fields = ("name", "age")
+
+        def __init__(self, *args):
+            self.args = args
+
+    walker = ToPythonWalker(dict(schema["definitions"]["User"], title="User"), wrappers={"User": User})
+    assert walker({"age": "20", "name": "foo"}).args == ("foo", 20)
+    assert walker.many([{"age": "20", "name": "foo"}])[0].args == ("foo", 20)
+
+
+def test_to_python__codegen():
+    from jsonschemawalker.codegen import to_python_function
+    classes = _callFUT(schema)
+    fn = to_python_function(schema, wrappers=classes)
+    result = fn({"name": "g", "owner": {"name": "foo", "age": "20"}, "members": [], "meta": None})
+    assert result.owner == classes["User"]("foo", 20)
+    assert "(**r)" not in fn.source
+
+
+def test_to_jsondict():
+    from jsonschemawalker import to_jsondict
+    classes = _callFUT(schema)
+    group = classes["Group"]("g", classes["User"]("foo", 20), [], None)
+    assert to_jsondict(schema, group) == {"name": "g", "owner": {"name": "foo", "age": 20}, "members": []}
@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+import json
+import pytest
+
+
+def _makeOne(*args, **kwargs):
+    from jsonschemawalker.resolver import RefResolver
+    return RefResolver(*args, **kwargs)
+
+
+def test_resolve__local():
+    schema = {"definitions": {"User": {"type": "object"}}}
+    assert _makeOne(schema).resolve("#/definitions/User") == ("", {"type": "object"})
+
+
+def test_resolve__escaped():
+    schema = {"definitions": {"a/b": {"type": "string"}, "m~n": {"type": "integer"}, "x y": {"type": "null"}}}
+    resolver = _makeOne(schema)
+    assert resolver.resolve("#/definitions/a~1b")[1] == {"type": "string"}
+    assert resolver.resolve("#/definitions/m~0n")[1] == {"type": "integer"}
+    assert resolver.resolve("#/definitions/x%20y")[1] == {"type": "null"}
+
+
+def test_resolve__array_index():
+    schema = {"items": [{"type": "string"}, {"type": "integer"}]}
+    assert _makeOne(schema).resolve("#/items/1")[1] == {"type": "integer"}
+
+
+def test_resolve__missing():
+    with pytest.raises(KeyError):
+        _makeOne({}).resolve("#/definitions/User")
+
+
+def test_resolve__external():
+    loaded = []
+
+    def loader(uri):
+        loaded.append(uri)
+        return {"definitions": {"User": {"properties": {"name": {"type": "string"}}}}}
+
+    resolver = _makeOne({}, base_uri="/schemas/main.json", loader=loader)
+    uri, target = resolver.resolve("common/user.json#/definitions/User")
+    assert uri == "/schemas/common/user.json"
+    assert target == {"properties": {"name": {"type": "string"}}}
+    resolver.resolve("common/user.json")
+    assert loaded == ["/schemas/common/user.json"]
+
+
+def test_compile__files(tmpdir):
+    from jsonschemawalker import compile, ToPythonWalker
+    from jsonschemawalker.resolver import RefResolver
+    tmpdir.mkdir("common")
+    tmpdir.join("common", "user.json").write(json.dumps({
+        "definitions": {
+            "User": {"properties": {"age": {"type": "integer"}, "group": {"$ref": "#/definitions/Group"}}},
+            "Group": {"properties": {"name": {"type": "string"}}}
+        }
+    }))
+    tmpdir.join("main.json").write(json.dumps({
+        "properties": {"users": {"type": "array", "items": {"$ref": "common/user.json#/definitions/User"}}}
+    }))
+    resolver = RefResolver.from_file(str(tmpdir.join("main.json")))
+    plan = compile(resolver.schema, resolver=resolver)
+    result = ToPythonWalker(plan)({"users": [{"age": "20", "group": {"name": "A"}}]})
+    assert result == {"users": [{"age": 20, "group": {"name": "A"}}]}
+    assert sorted(plan.references.keys()) == [
+        str(tmpdir.join("common", "user.json")) + "#/definitions/Group",
+        str(tmpdir.join("common", "user.json")) + "#/definitions/User",
+    ]
+
+
+def test_compile__files__all_of(tmpdir):
+    from jsonschemawalker import compile, ToPythonWalker
+    from jsonschemawalker.resolver import RefResolver
+    tmpdir.join("common.json").write(json.dumps({
+        "definitions": {
+            "Owned": {"properties": {"group": {"$ref": "#/definitions/Group"}}},
+            "Group": {"properties": {"id": {"type": "integer"}}}
+        }
+    }))
+    tmpdir.join("main.json").write(json.dumps({
+        "definitions": {
+            "Group": {"properties": {"name": {"type": "string"}}}  # not the one of common.json
+        },
+        "allOf": [
+            {"$ref": "common.json#/definitions/Owned"},
+            {"properties": {"name": {"type": "string"}}}
+        ]
+    }))
+    resolver = RefResolver.from_file(str(tmpdir.join("main.json")))
+    plan = compile(resolver.schema, resolver=resolver)
+    result = ToPythonWalker(plan)({"name": "x", "group": {"id": "1"}})
+    assert result == {"group": {"id": 1}, "name": "x"}
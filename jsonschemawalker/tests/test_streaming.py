@@ -0,0 +1,46 @@
+# -*- coding:utf-8 -*-
+import io
+import json
+import pytest
+
+schema = {"type": "object",
+          "definitions": {
+              "User": {"properties": {"name": {"type": "string"}, "age": {"type": "integer"}}}
+          },
+          "properties": {"meta": {}, "users": {"type": "array", "items": {"$ref": "#/definitions/User"}}}}
+
+
+def _callFUT(*args, **kwargs):
+    from jsonschemawalker.streaming import iter_python
+    return iter_python(*args, **kwargs)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_pointer(chunk_size):
+    doc = {"meta": {"total": 2, "note": "ユーザー"}, "users": [{"name": "foo", "age": "20"}, {"name": "bar", "age": 30}]}
+    source = io.BytesIO(json.dumps(doc, ensure_ascii=False).encode("utf-8"))
+    result = _callFUT(schema, source, pointer="/users", chunk_size=chunk_size)
+    assert list(result) == [{"name": "foo", "age": 20}, {"name": "bar", "age": 30}]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+def test_top_level(chunk_size):
+    source = io.StringIO(' [ "1" , 22 ,3.5e1, 1000 ] ')
+    result = _callFUT({"type": "array", "items": {"type": "integer"}}, source, chunk_size=chunk_size)
+    assert list(result) == [1, 22, 35, 1000]
+
+
+def test_empty():
+    assert list(_callFUT({"type": "array", "items": {}}, io.StringIO("[]"))) == []
+
+
+def test_chunks_iterable():
+    from jsonschemawalker.streaming import iter_array
+    chunks = [b'{"a": [1, {"b": [', b'true, null]}], "b": {"c": ["x", "y', b'"]}}']
+    assert list(iter_array(chunks, "/b/c")) == ["x", "y"]
+    assert list(iter_array(chunks, "/a/1/b")) == [True, None]
+
+
+def test_broken():
+    with pytest.raises(ValueError):
+        list(_callFUT({"type": "array", "items": {}}, io.StringIO("[1, 2")))
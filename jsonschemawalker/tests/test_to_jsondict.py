@@ -3,6 +3,8 @@ import pytest
 from datetime import datetime
 import pytz
 
+pytestmark = pytest.mark.usefixtures("backend")
+
 
 def _callFUT(*args, **kwargs):
     from jsonschemawalker import to_jsondict
@@ -21,6 +23,8 @@ cands = [
     ("number", "1.0", 1.0),
     ("boolean", "true", True),
     ("boolean", "false", False),
+    ("boolean", True, True),
+    ("boolean", False, False),
     ("null", "null", None),
 ]
 
@@ -35,7 +39,8 @@ def test_atom_convert(type, value, expected):
 cands = [
     ("string", "date-time", None, None),
     ("string", "date-time", datetime(2000, 1, 1, 0, 0, 0, 0, pytz.utc), "2000-01-01T00:00:00+00:00"),
-    ("string", "date-time", datetime(2000, 1, 1), "2000-01-01T00:00:00+00:00")
+    ("string", "date-time", datetime(2000, 1, 1), "2000-01-01T00:00:00+00:00"),
+    ("string", "date-time", pytz.timezone("Asia/Tokyo").localize(datetime(2000, 1, 1)), "2000-01-01T00:00:00+09:00"),
 ]
 
 
@@ -85,6 +90,17 @@ def test_object__noskip():
     assert result == {"name": "foo", "age": None}
 
 
+def test_object__noskip__nested_none():
+    # a nested object being None is serialized as null, not as an object of nulls
+    schema = {"type": "object",
+              "properties": {"o": {"type": "object", "properties": {"x": {"type": "integer"}}}}}
+
+    class value:
+        o = None
+
+    assert _callFUT(schema, value, verbose=True) == {"o": None}
+
+
 def test_object__dict():
     schema = {"type": "object",
               "properties": {"name": {"type": "string"}, "age": {"type": "integer"}}}
@@ -252,3 +268,105 @@ def test_object__with_ref__array():
     value = Group(name="foo", users=[User(name="foo", age="20")])
     result = _callFUT(schema, value)
     assert result == {"users": [{"name": "foo", "age": 20}]}
+
+
+point_schema = {"type": "object",
+                "definitions": {
+                    "Point2": {"properties": {"x": {"type": "integer"}, "y": {"type": "integer"}}},
+                    "Point3": {"properties": {"x": {"type": "integer"}, "y": {"type": "integer"}, "z": {"type": "integer"}}}
+                },
+                "anyOf": [{"$ref": "#/definitions/Point2"}, {"$ref": "#/definitions/Point3"}]
+                }
+
+
+def test_object__any_of__slots():
+    class Point3(object):
+        __slots__ = ("x", "y", "z")
+
+        def __init__(self, x, y, z):
+            self.x, self.y, self.z = x, y, z
+
+    result = _callFUT(point_schema, Point3(1, 2, 3))
+    assert result == {"x": 1, "y": 2, "z": 3}
+
+
+def test_object__any_of__property():
+    class Point3(object):
+        x = 1
+        y = 2
+
+        @property
+        def z(self):
+            return 3
+
+    result = _callFUT(point_schema, Point3())
+    assert result == {"x": 1, "y": 2, "z": 3}
+
+
+def test_object__any_of__cached_per_class():
+    from jsonschemawalker import ToJSONDictWalker
+    calls = []
+
+    def getter(ob, k, default):
+        calls.append(k)
+        return getattr(ob, k, default)
+
+    class Point3(object):
+        def __init__(self, x, y, z):
+            self.x, self.y, self.z = x, y, z
+
+    walker = ToJSONDictWalker(point_schema, getter)
+    assert walker(Point3(1, 2, 3)) == {"x": 1, "y": 2, "z": 3}
+    del calls[:]
+    assert walker(Point3(4, 5, 6)) == {"x": 4, "y": 5, "z": 6}
+    assert calls == ["x", "y", "z"]
+
+
+def test_object__any_of__cached_per_class__none():
+    from jsonschemawalker import ToJSONDictWalker
+
+    class Point3(object):
+        def __init__(self, x, y, z):
+            self.x, self.y, self.z = x, y, z
+
+    walker = ToJSONDictWalker(point_schema, getattr)
+    assert walker(Point3(1, 2, None)) == {"x": 1, "y": 2}  # z is None, skipped without verbose
+    assert walker(Point3(1, 2, 3)) == {"x": 1, "y": 2, "z": 3}
+
+
+def test_object__any_of__registered():
+    from jsonschemawalker import ToJSONDictWalker
+
+    class Point(object):
+        def __init__(self, x, y, z):
+            self.x, self.y, self.z = x, y, z
+
+    walker = ToJSONDictWalker(point_schema, getattr, branches={Point: "Point2"})
+    assert walker(Point(1, 2, 3)) == {"x": 1, "y": 2}
+
+
+def test_object__any_of__registered__subclass():
+    from jsonschemawalker import ToJSONDictWalker
+
+    class Point(object):
+        def __init__(self, x, y, z):
+            self.x, self.y, self.z = x, y, z
+
+    class ColoredPoint(Point):
+        pass
+
+    walker = ToJSONDictWalker(point_schema, getattr, branches={Point: "Point2"})
+    assert walker(ColoredPoint(1, 2, 3)) == {"x": 1, "y": 2}
+
+
+def test_object__any_of__registered__after_use():
+    from jsonschemawalker import ToJSONDictWalker
+
+    class Point(object):
+        def __init__(self, x, y, z):
+            self.x, self.y, self.z = x, y, z
+
+    walker = ToJSONDictWalker(point_schema, getattr)
+    assert walker(Point(1, 2, 3)) == {"x": 1, "y": 2, "z": 3}
+    walker.register_branch(Point, "Point2")
+    assert walker(Point(1, 2, 3)) == {"x": 1, "y": 2}
@@ -3,6 +3,8 @@ import pytest
 from datetime import datetime
 import pytz
 
+pytestmark = pytest.mark.usefixtures("backend")
+
 
 def _callFUT(*args, **kwargs):
     from jsonschemawalker import to_python
@@ -21,6 +23,8 @@ cands = [
     ("number", "1.0", 1.0),
     ("boolean", "true", True),
     ("boolean", "false", False),
+    ("boolean", True, True),
+    ("boolean", False, False),
     ("null", "null", None),
 ]
 
@@ -35,6 +39,9 @@ def test_atom_convert(type, value, expected):
 cands = [
     ("string", "date-time", None, None),
     ("string", "date-time", "2000-01-01T00:00:00Z", datetime(2000, 1, 1, 0, 0, 0, 0, pytz.utc)),
+    ("string", "date-time", "2000-01-01T09:00:00.5+09:00", datetime(2000, 1, 1, 0, 0, 0, 500000, pytz.utc)),
+    ("string", "date-time", "2000-01-01T00:00:00", datetime(2000, 1, 1, 0, 0, 0, 0)),
+    ("string", "date-time", "2000/01/01T01:00:00Z", datetime(2000, 1, 1, 1, 0, 0, 0, pytz.utc)),
 ]
 
 
@@ -242,3 +249,72 @@ def test_wrapper2():
     value = {"name": "runtime-error", "message": "anything is wrong!"}
     result = _callFUT(schema, value, {"Failure": Failure})
     assert result == Failure(name='runtime-error', message='anything is wrong!')
+
+
+def test_as_datetime_cached():
+    from jsonschemawalker import as_datetime_cached
+    as_datetime_cached.cache_clear()
+    x = as_datetime_cached("2000-01-01T00:00:00Z")
+    y = as_datetime_cached("2000-01-01T00:00:00Z")
+    assert x is y
+    assert as_datetime_cached.cache_info().hits == 1
+
+
+def _pets_schema(**kwargs):
+    schema = {"type": "object",
+              "definitions": {
+                  "Dog": {"properties": {"kind": {"type": "string"}, "name": {"type": "string"}, "age": {"type": "integer"}}},
+                  "Cat": {"properties": {"kind": {"type": "string"}, "name": {"type": "string"}, "lives": {"type": "integer"}}}
+              },
+              "oneOf": [{"$ref": "#/definitions/Dog"}, {"$ref": "#/definitions/Cat"}]
+              }
+    schema.update(kwargs)
+    return schema
+
+
+def test_one_of__discriminator():
+    schema = _pets_schema(discriminator={"propertyName": "kind"})
+    # by scoring, this would be a Dog
+    value = {"kind": "Cat", "name": "tama", "age": "3"}
+    result = _callFUT(schema, value)
+    assert result == {"kind": "Cat", "name": "tama", "lives": None}
+
+
+def test_one_of__discriminator_mapping():
+    schema = _pets_schema(discriminator={"propertyName": "kind", "mapping": {"cat": "#/definitions/Cat"}})
+    value = {"kind": "cat", "name": "tama", "age": "3"}
+    result = _callFUT(schema, value)
+    assert result == {"kind": "cat", "name": "tama", "lives": None}
+
+
+def test_one_of__const():
+    schema = _pets_schema()
+    schema["definitions"]["Dog"]["properties"]["kind"]["const"] = "dog"
+    schema["definitions"]["Cat"]["properties"]["kind"]["enum"] = ["cat"]
+    value = {"kind": "cat", "name": "tama", "age": "3"}
+    result = _callFUT(schema, value)
+    assert result == {"kind": "cat", "name": "tama", "lives": None}
+
+
+def test_one_of__unknown_tag():
+    schema = _pets_schema(discriminator={"propertyName": "kind"})
+    value = {"kind": "Bird", "name": "piyo", "lives": "1"}
+    result = _callFUT(schema, value)
+    assert result == {"kind": "Bird", "name": "piyo", "lives": 1}
+
+
+def test_object__all_of__inline_and_nested():
+    schema = {"type": "object",
+              "definitions": {
+                  "HasName": {"properties": {"name": {"type": "string"}}, "required": ["name"]},
+                  "HasCreatedAt": {"properties": {"created_at": {"type": "string", "format": "date-time"}}},
+                  "Base": {"allOf": [{"$ref": "#/definitions/HasName"}, {"$ref": "#/definitions/HasCreatedAt"}]}
+              },
+              "allOf": [
+                  {"$ref": "#/definitions/Base"},
+                  {"properties": {"age": {"type": "integer"}}, "required": ["age"]},
+                  {"patternProperties": {"^x-": {"type": "integer"}}, "additionalProperties": False},
+              ]}
+    value = {"name": "foo", "created_at": "2000-01-01T01:01:00Z", "age": "20", "x-score": "1", "other": "?"}
+    result = _callFUT(schema, value)
+    assert result == {"name": "foo", "created_at": datetime(2000, 1, 1, 1, 1, 0, 0, pytz.utc), "age": 20, "x-score": 1}
@@ -0,0 +1,142 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+schema = {
+    "type": "object",
+    "definitions": {
+        "User": {"type": "object",
+                 "required": ["name"],
+                 "properties": {"name": {"type": "string", "minLength": 1, "maxLength": 8, "pattern": "^[a-z]+$"},
+                                "age": {"type": "integer", "minimum": 0, "maximum": 200},
+                                "role": {"type": "string", "enum": ["admin", "user"]}},
+                 "additionalProperties": False}
+    },
+    "properties": {
+        "owner": {"$ref": "#/definitions/User"},
+        "members": {"type": "array", "items": {"$ref": "#/definitions/User"}, "minItems": 1, "maxItems": 3},
+        "created_at": {"type": "string", "format": "date-time"},
+    }}
+
+
+def _callFUT(*args, **kwargs):
+    from jsonschemawalker.validation import to_python_validated
+    return to_python_validated(*args, **kwargs)
+
+
+def test_valid():
+    from datetime import datetime
+    data = {"owner": {"name": "foo", "age": 20, "role": "admin"}, "members": [{"name": "bar"}],
+            "created_at": "2000-01-01T00:00:00Z"}
+    result = _callFUT(schema, data)
+    assert result["owner"] == {"name": "foo", "age": 20, "role": "admin"}
+    assert result["members"] == [{"name": "bar", "age": None, "role": None}]
+    assert isinstance(result["created_at"], datetime)
+
+
+@pytest.mark.parametrize("data, pointer, validator", [
+    ({"owner": {"age": 20}}, "/owner", "required"),
+    ({"owner": {"name": 1}}, "/owner/name", "type"),
+    ({"owner": {"name": ""}}, "/owner/name", "minLength"),
+    ({"owner": {"name": "abcdefghi"}}, "/owner/name", "maxLength"),
+    ({"owner": {"name": "Foo"}}, "/owner/name", "pattern"),
+    ({"owner": {"name": "foo", "age": "20"}}, "/owner/age", "type"),
+    ({"owner": {"name": "foo", "age": -1}}, "/owner/age", "minimum"),
+    ({"owner": {"name": "foo", "age": 201}}, "/owner/age", "maximum"),
+    ({"owner": {"name": "foo", "role": "root"}}, "/owner/role", "enum"),
+    ({"owner": {"name": "foo", "x": 1}}, "/owner", "additionalProperties"),
+    ({"members": []}, "/members", "minItems"),
+    ({"members": [{"name": "a"}] * 4}, "/members", "maxItems"),
+    ({"members": [{"name": "a"}, {"name": 2}]}, "/members/1/name", "type"),
+    ({"owner": None}, "/owner", "type"),
+    ([], "", "type"),
+])
+def test_invalid(data, pointer, validator):
+    from jsonschemawalker.validation import ValidationError
+    with pytest.raises(ValidationError) as e:
+        _callFUT(schema, data)
+    [error] = e.value.errors
+    assert error.pointer == pointer
+    assert error.validator == validator
+
+
+def test_collect_all():
+    from jsonschemawalker.validation import ValidationErrors
+    data = {"owner": {"name": "Foo", "age": -1}, "members": [{"name": "a"}, {"age": 1}, {"name": "b", "y": 1}]}
+    with pytest.raises(ValidationErrors) as e:
+        _callFUT(schema, data, fail_fast=False)
+    assert [(error.pointer, error.validator) for error in e.value.errors] == [
+        ("/owner/name", "pattern"),
+        ("/owner/age", "minimum"),
+        ("/members/1", "required"),
+        ("/members/2", "additionalProperties"),
+    ]
+    assert e.value.errors[0].schema_path == "#/definitions/User/properties/name"
+    assert "/members/1: 'name' is a required property" in str(e.value)
+
+
+def test_escaped_pointer():
+    from jsonschemawalker.validation import ValidationError
+    schema = {"type": "object", "patternProperties": {"/": {"type": "integer"}}}
+    with pytest.raises(ValidationError) as e:
+        _callFUT(schema, {"a/b": "x"})
+    assert e.value.pointer == "/a~1b"
+
+
+def test_wrappers():
+    from collections import namedtuple
+    User = namedtuple("User", "name age role")
+    result = _callFUT(schema, {"owner": {"name": "foo"}}, wrappers={"User": User})
+    assert result["owner"] == User(name="foo", age=None, role=None)
+
+
+@pytest.mark.parametrize("iterative_fallback", [False, True])
+def test_deep(iterative_fallback):
+    # never converted without validation, on the stack-based engine
+    from jsonschemawalker.validation import ValidatingToPythonWalker
+    schema = {"type": "object",
+              "definitions": {"Node": {"type": "object",
+                                       "properties": {"id": {"type": "integer", "minimum": 0},
+                                                      "next": {"$ref": "#/definitions/Node"}},
+                                       "additionalProperties": False}},
+              "properties": {"root": {"$ref": "#/definitions/Node"}}}
+    data = current = {"id": 0}
+    for _ in range(2000):
+        current["next"] = {"id": 0}
+        current = current["next"]
+    current.update({"id": -5, "bogus": 1})
+    walker = ValidatingToPythonWalker(schema, iterative_fallback=iterative_fallback)
+    with pytest.raises(RecursionError):
+        walker({"root": data})
+
+
+def test_many():
+    from jsonschemawalker.validation import ValidatingToPythonWalker, ValidationError
+    walker = ValidatingToPythonWalker({"properties": {"age": {"type": "integer", "minimum": 0}}})
+    assert walker.many([{"age": 1}, {}]) == [{"age": 1}, {"age": None}]
+    with pytest.raises(ValidationError) as e:
+        walker.many([{"age": 1}, {"age": -5}])
+    assert (e.value.pointer, e.value.validator) == ("/1/age", "minimum")
+
+
+@pytest.mark.parametrize("fail_fast", [True, False])
+@pytest.mark.parametrize("schema", [
+    {"properties": {"name": {"type": "string"}}},
+    {"patternProperties": {"^x": {"type": "string"}}},
+    {"oneOf": [{"properties": {"a": {"type": "string"}}}, {"properties": {"b": {"type": "string"}}}]},
+])
+def test_not_object(schema, fail_fast):
+    from jsonschemawalker.validation import ValidatingToPythonWalker, ValidationError
+    with pytest.raises(ValidationError) as e:
+        ValidatingToPythonWalker(schema, fail_fast=fail_fast)("abc")
+    assert [(error.pointer, error.validator) for error in e.value.errors] == [("", "type")]
+
+
+def test_collect_all__container_and_items():
+    from jsonschemawalker.validation import ValidationErrors
+    data = {"members": [{"name": "a"}, {"name": "b"}, {"name": "c"}, {"name": "D"}]}
+    with pytest.raises(ValidationErrors) as e:
+        _callFUT(schema, data, fail_fast=False)
+    assert [(error.pointer, error.validator) for error in e.value.errors] == [
+        ("/members", "maxItems"),
+        ("/members/3/name", "pattern"),
+    ]
@@ -0,0 +1,304 @@
+# -*- coding:utf-8 -*-
+from jsonschemawalker import ToPythonWalker, walker_cache, _wrappers_key
+from jsonschemawalker.resolver import escape
+
+# validation fused into the conversion walk of ToPythonWalker.
+# the raw json values are checked (as jsonschema does), before they are converted.
+# supported keywords: type, required, enum, minimum, maximum, minLength, maxLength, pattern,
+# additionalProperties: false, minItems, maxItems. for oneOf/anyOf, only the selected branch is checked.
+# errors are raised with the path of the value; the walker itself keeps no per-call state.
+
+
+class ValidationError(ValueError):
+    def __init__(self, message, validator=None, value=None, schema_path=None):
+        super(ValidationError, self).__init__(message)
+        self.message = message
+        self.validator = validator
+        self.value = value
+        self.schema_path = schema_path
+        self.path = []  # keys and indices, from the root to the value
+
+    @property
+    def errors(self):
+        return [self]
+
+    @property
+    def pointer(self):
+        return "".join("/" + escape(str(k)) for k in self.path)
+
+    def prepend(self, k):
+        self.path.insert(0, k)
+
+    def __str__(self):
+        return "{}: {}".format(self.pointer or "/", self.message)
+
+
+class ValidationErrors(ValidationError):
+    def __init__(self, errors):
+        self._errors = []
+        for e in errors:
+            self._errors.extend(e.errors)
+        message = "{} validation errors".format(len(self._errors))
+        super(ValidationErrors, self).__init__(message)
+
+    @property
+    def errors(self):
+        return self._errors
+
+    def prepend(self, k):
+        for e in self._errors:
+            e.prepend(k)
+
+    def __str__(self):
+        return "\n".join([self.message] + [str(e) for e in self._errors])
+
+
+_types = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool)) or (isinstance(v, float) and v.is_integer()),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+}
+
+
+_exact = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "null": type(None),
+    "object": dict,
+    "array": list,
+}
+
+
+# visitor -> values whose contents can be walked after a failed check
+_containers = {"walk_array": list, "walk_one_of": dict, "walk_reference": (dict, list)}
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def compile_checks(schema, control):
+    # -> list of functions, each returns (keyword, message) on failure, or None
+    checks = []
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        predicates = [_types[t] for t in types if t in _types]
+        exact = frozenset(_exact[t] for t in types if t in _exact)  # fast path, without calls
+
+        def check_type(v):
+            if v.__class__ not in exact and not any(p(v) for p in predicates):
+                return "type", "{!r} is not of type {}".format(v, ", ".join(repr(t) for t in types))
+        if predicates:
+            checks.append(check_type)
+    if "enum" in schema:
+        enum = schema["enum"]
+
+        def check_enum(v):
+            if v not in enum:
+                return "enum", "{!r} is not one of {!r}".format(v, enum)
+        checks.append(check_enum)
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+
+        def check_minimum(v):
+            if _is_number(v) and v < minimum:
+                return "minimum", "{!r} is less than the minimum of {!r}".format(v, minimum)
+        checks.append(check_minimum)
+    if "maximum" in schema:
+        maximum = schema["maximum"]
+
+        def check_maximum(v):
+            if _is_number(v) and v > maximum:
+                return "maximum", "{!r} is greater than the maximum of {!r}".format(v, maximum)
+        checks.append(check_maximum)
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+
+        def check_min_length(v):
+            if isinstance(v, str) and len(v) < min_length:
+                return "minLength", "{!r} is too short".format(v)
+        checks.append(check_min_length)
+    if "maxLength" in schema:
+        max_length = schema["maxLength"]
+
+        def check_max_length(v):
+            if isinstance(v, str) and len(v) > max_length:
+                return "maxLength", "{!r} is too long".format(v)
+        checks.append(check_max_length)
+    if "pattern" in schema:
+        regexp = control.get_regexp(schema["pattern"])
+
+        def check_pattern(v):
+            if isinstance(v, str) and regexp.search(v) is None:
+                return "pattern", "{!r} does not match {!r}".format(v, regexp.pattern)
+        checks.append(check_pattern)
+    if "minItems" in schema:
+        min_items = schema["minItems"]
+
+        def check_min_items(v):
+            if isinstance(v, list) and len(v) < min_items:
+                return "minItems", "{!r} is too short".format(v)
+        checks.append(check_min_items)
+    if "maxItems" in schema:
+        max_items = schema["maxItems"]
+
+        def check_max_items(v):
+            if isinstance(v, list) and len(v) > max_items:
+                return "maxItems", "{!r} is too long".format(v)
+        checks.append(check_max_items)
+    if "required" in schema and isinstance(schema["required"], list):
+        required = schema["required"]
+
+        def check_required(v):
+            if isinstance(v, dict):
+                missing = [k for k in required if k not in v]
+                if missing:
+                    return "required", "{} is a required property".format(", ".join(repr(k) for k in missing))
+        checks.append(check_required)
+    if schema.get("additionalProperties", True) is False:
+        names = frozenset(k for k in schema.get("properties", {}) if k != "$order")
+        patterns = [control.get_regexp(p) for p in schema.get("patternProperties", {})]
+
+        def check_additional(v):
+            if isinstance(v, dict):
+                extras = [k for k in v if k not in names and not any(rx.search(k) for rx in patterns)]
+                if extras:
+                    return ("additionalProperties",
+                            "Additional properties are not allowed ({} were unexpected)".format(
+                                ", ".join(repr(k) for k in extras)))
+        checks.append(check_additional)
+    return checks
+
+
+class ValidatingToPythonWalker(ToPythonWalker):
+    # fail_fast=False collects every error of the value, and raises them together as ValidationErrors
+    def __init__(self, *args, **kwargs):
+        self.fail_fast = kwargs.pop("fail_fast", True)
+        super(ValidatingToPythonWalker, self).__init__(*args, **kwargs)
+        self.checks = {}  # node -> list of check functions
+
+    def __call__(self, value):
+        # no retry on the stack-based engine, that would convert without validating.
+        # a value deeper than the recursion limit raises RecursionError
+        return self.walk(self.plan.root, value)
+
+    def get_checks(self, node):
+        try:
+            return self.checks[node]
+        except KeyError:
+            checks = self.checks[node] = compile_checks(node.schema, self.control)
+            return checks
+
+    def validate(self, node, value):
+        errors = None
+        for check in self.get_checks(node):
+            found = check(value)
+            if found is not None:
+                validator, message = found
+                error = ValidationError(message, validator=validator, value=value, schema_path=node.path)
+                if self.fail_fast:
+                    raise error
+                if errors is None:
+                    errors = []
+                errors.append(error)
+        return errors
+
+    def check_object(self, node, value, errors):
+        # a value that cannot be walked as an object, also when the schema has no explicit "type"
+        if value is None or isinstance(value, dict) or any(e.validator == "type" for e in errors or ()):
+            return errors
+        error = ValidationError("{!r} is not of type 'object'".format(value), validator="type", value=value,
+                                schema_path=node.path)
+        if self.fail_fast:
+            raise error
+        return (errors or []) + [error]
+
+    def walk(self, node, value):
+        # objects are checked in walk_object, that is also reached from $ref without passing here
+        visitor = node.visitor
+        if visitor == "walk_object":
+            return self.walk_object(node, value)
+        errors = self.validate(node, value)
+        if visitor == "walk_one_of":
+            errors = self.check_object(node, value, errors)
+        if errors:
+            # fail_fast=False: the contents are walked anyway, so that their errors are collected too
+            if isinstance(value, _containers.get(visitor, ())):
+                try:
+                    getattr(self, visitor)(node, value)
+                except ValidationError as e:
+                    errors.extend(e.errors)
+            raise ValidationErrors(errors)
+        return getattr(self, visitor)(node, value)
+
+    def walk_object(self, node, value, name=None):
+        errors = self.validate(node, value) or []
+        if not isinstance(value, dict):
+            errors = self.check_object(node, value, errors)
+            if errors:
+                raise ValidationErrors(errors)
+            return None
+        r = self.factory()
+        if node.properties is None:
+            properties = node.iterate(value)
+        else:
+            properties = node.properties
+        for k, subnode in properties:
+            if k not in value:
+                # not present: converted as null, without checks (a missing property is found by `required`)
+                r[k] = self.walk_missing(subnode)
+                continue
+            try:
+                r[k] = self.walk(subnode, value[k])
+            except ValidationError as e:
+                e.prepend(k)
+                if self.fail_fast:
+                    raise
+                errors.append(e)
+        if errors:
+            raise ValidationErrors(errors)
+        return self.get_wrapper(name or node.name, r, node)
+
+    def walk_missing(self, node):
+        while node.visitor == "walk_reference":
+            node = node.target
+        if node.visitor == "walk_atom":
+            return self.walk_atom(node, None)
+        return None
+
+    def walk_array(self, node, value):
+        if value is None:
+            return None
+        return self.walk_items(node.items, value)
+
+    def walk_items(self, node, values):
+        r = []
+        errors = []
+        for i, v in enumerate(values):
+            try:
+                r.append(self.walk(node, v))
+            except ValidationError as e:
+                e.prepend(i)
+                if self.fail_fast:
+                    raise
+                errors.append(e)
+        if errors:
+            raise ValidationErrors(errors)
+        return r
+
+    def many(self, values):
+        # value by value, as the column-wise walk_*_many methods do not validate.
+        # errors are prefixed with the index of the value
+        return self.walk_items(self.plan.root, values)
+
+
+def to_python_validated(schema, data, wrappers=None, fail_fast=True):
+    options = (ValidatingToPythonWalker, _wrappers_key(wrappers), fail_fast)
+    return walker_cache.get(schema, options,
+                            lambda: ValidatingToPythonWalker(schema, wrappers, fail_fast=fail_fast))(data)
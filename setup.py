@@ -16,14 +16,18 @@ except IOError:
 install_requires=[
     'jsonschema',
     'python-dateutil',
-    'pytz'
     ]
 
 docs_extras = [
     ]
 
+orjson_extras = [
+    "orjson",
+    ]
+
 tests_require =[
-    "pytest"
+    "pytest",
+    "pytz"
 ]
 testing_extras = tests_require + [
     ]
@@ -52,13 +56,14 @@ setup(name='jsonschemawalker',
       author="podhmo",
       author_email="ababjam61@gmail.com",
       url="https://github.com/podhmo/jsonschemawalker",
-      packages=find_packages(exclude=["jsonschemawalker.tests"]),
+      packages=find_packages(exclude=["jsonschemawalker.tests", "benchmarks"]),
       include_package_data=True,
       zip_safe=False,
       install_requires = install_requires,
       extras_require = {
           'testing':testing_extras,
           'docs':docs_extras,
+          'orjson':orjson_extras,
           },
       tests_require = tests_require,
       cmdclass = {'test': PyTest},